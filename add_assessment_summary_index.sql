@@ -0,0 +1,7 @@
+-- Migration: Index pre-bid assessments by organization and assessment time
+-- Description: The assessment summary aggregates an organization's assessments in SQL
+-- (optionally per month of assessed_at); this index limits it, and the per-organization
+-- listing ordered by assessed_at, to that organization's rows
+
+CREATE INDEX IF NOT EXISTS idx_pre_bid_assessments_org_assessed_at
+ON pre_bid_assessments (organization_id, assessed_at);
@@ -0,0 +1,16 @@
+-- Migration: GIN indexes for directory array/JSONB filters
+-- Description: Serves jurisdiction_codes/naics_codes overlap (&&) and containment (@>)
+-- and certifications containment (certifications @> '{"mbe": true}') used by
+-- directory search and opportunity matching, which were full table scans
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_jurisdiction_codes
+ON subcontractor_directory USING GIN (jurisdiction_codes);
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_naics_codes
+ON subcontractor_directory USING GIN (naics_codes);
+
+-- jsonb_path_ops: smaller and faster than the default opclass, supports @> only
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_certifications
+ON subcontractor_directory USING GIN (certifications jsonb_path_ops);
+
+ANALYZE subcontractor_directory;
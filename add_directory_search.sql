@@ -0,0 +1,24 @@
+-- Migration: Ranked full-text and fuzzy search for the subcontractor directory
+-- Description: Weighted tsvector over legal_name, capabilities and location_city,
+-- plus a trigram index on legal_name for typo-tolerant name matching
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE subcontractor_directory
+ADD COLUMN IF NOT EXISTS search_vector tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(legal_name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(capabilities, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(location_city, '')), 'C')
+) STORED;
+
+COMMENT ON COLUMN subcontractor_directory.search_vector IS
+'Generated full-text document (name A, capabilities B, city C) used by ranked directory search';
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_search_vector
+ON subcontractor_directory USING GIN (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_legal_name_trgm
+ON subcontractor_directory USING GIN (legal_name gin_trgm_ops);
+
+ANALYZE subcontractor_directory;
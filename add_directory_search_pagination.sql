@@ -0,0 +1,10 @@
+-- Migration: Index for keyset-paginated directory search
+-- Description: Matches the search sort key (rating, projects_completed, id, all descending,
+-- NULLs as 0) so each page is an index range scan instead of a full sort
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_search_order
+ON subcontractor_directory (
+    (coalesce(rating, 0)) DESC,
+    (coalesce(projects_completed, 0)) DESC,
+    id DESC
+);
@@ -0,0 +1,77 @@
+-- Migration: One outreach record per organization, opportunity and subcontractor
+-- Description: Backs the single multi-row INSERT ... ON CONFLICT DO NOTHING used by bulk
+-- outreach creation. Duplicate records are merged first: the most advanced record of each
+-- group is kept (COMMITTED, then DECLINED, RESPONDED, CONTACTED; latest contact_date on
+-- ties), the notes of the whole group are combined into it, and the removed records are
+-- copied to subcontractor_outreach_duplicates so the merge can be reviewed or undone.
+-- This does not change contractors_using_count, which counts distinct organizations.
+
+CREATE TEMP TABLE ranked_outreach ON COMMIT DROP AS
+SELECT id,
+       organization_id,
+       opportunity_id,
+       subcontractor_id,
+       row_number() OVER (
+           PARTITION BY organization_id, opportunity_id, subcontractor_id
+           ORDER BY CASE status
+                        WHEN 'COMMITTED' THEN 4
+                        WHEN 'DECLINED' THEN 3
+                        WHEN 'RESPONDED' THEN 2
+                        WHEN 'CONTACTED' THEN 1
+                        ELSE 0
+                    END DESC,
+                    contact_date DESC NULLS LAST,
+                    id
+       ) AS keep_rank,
+       count(*) OVER (
+           PARTITION BY organization_id, opportunity_id, subcontractor_id
+       ) AS group_size
+FROM subcontractor_outreach
+-- NULL keys never conflict under the unique constraint
+WHERE organization_id IS NOT NULL
+AND opportunity_id IS NOT NULL
+AND subcontractor_id IS NOT NULL;
+
+-- Removed records, as they were
+CREATE TABLE IF NOT EXISTS subcontractor_outreach_duplicates
+(LIKE subcontractor_outreach INCLUDING DEFAULTS);
+
+INSERT INTO subcontractor_outreach_duplicates
+SELECT so.*
+FROM subcontractor_outreach so
+JOIN ranked_outreach r ON r.id = so.id
+WHERE r.keep_rank > 1;
+
+-- Every note of a group, oldest contact first, goes to the kept record
+UPDATE subcontractor_outreach so
+SET notes = merged.notes
+FROM ranked_outreach keep
+JOIN (
+    SELECT r.organization_id,
+           r.opportunity_id,
+           r.subcontractor_id,
+           string_agg(o.notes, E'\n' ORDER BY o.contact_date NULLS FIRST, o.id) AS notes
+    FROM ranked_outreach r
+    JOIN subcontractor_outreach o ON o.id = r.id
+    WHERE r.group_size > 1
+    AND nullif(btrim(o.notes), '') IS NOT NULL
+    GROUP BY r.organization_id, r.opportunity_id, r.subcontractor_id
+) merged
+ON merged.organization_id = keep.organization_id
+AND merged.opportunity_id = keep.opportunity_id
+AND merged.subcontractor_id = keep.subcontractor_id
+WHERE so.id = keep.id
+AND keep.keep_rank = 1
+AND keep.group_size > 1;
+
+DELETE FROM subcontractor_outreach so
+USING ranked_outreach r
+WHERE so.id = r.id
+AND r.keep_rank > 1;
+
+ALTER TABLE subcontractor_outreach
+DROP CONSTRAINT IF EXISTS uq_subcontractor_outreach_org_opportunity_sub;
+
+ALTER TABLE subcontractor_outreach
+ADD CONSTRAINT uq_subcontractor_outreach_org_opportunity_sub
+UNIQUE (organization_id, opportunity_id, subcontractor_id);
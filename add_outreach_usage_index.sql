@@ -0,0 +1,19 @@
+-- Migration: Index for incremental contractors_using_count maintenance
+-- Description: Outreach writes probe for other outreach from the same organization to the
+-- same subcontractor (NOT EXISTS) before adjusting contractors_using_count by one; this
+-- index also serves the per-subcontractor COUNT(DISTINCT organization_id) recount
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_outreach_subcontractor_org
+ON subcontractor_outreach (subcontractor_id, organization_id);
+
+-- Reconcile existing counts with the outreach table before switching to deltas
+UPDATE subcontractor_directory d
+SET contractors_using_count = c.usage_count
+FROM (
+    SELECT sd.id, count(DISTINCT so.organization_id) AS usage_count
+    FROM subcontractor_directory sd
+    LEFT JOIN subcontractor_outreach so ON so.subcontractor_id = sd.id
+    GROUP BY sd.id
+) c
+WHERE d.id = c.id
+AND d.contractors_using_count IS DISTINCT FROM c.usage_count;
@@ -0,0 +1,33 @@
+-- Migration: Link subcontractors to their directory entry
+-- Description: Validation looks up directory entries by subcontractors.directory_id,
+-- falling back to an indexed legal_name match for unlinked subcontractors
+
+ALTER TABLE subcontractors
+ADD COLUMN IF NOT EXISTS directory_id UUID REFERENCES subcontractor_directory(id) ON DELETE SET NULL;
+
+COMMENT ON COLUMN subcontractors.directory_id IS
+'Directory entry this subcontractor was copied from; NULL means match by legal_name';
+
+CREATE INDEX IF NOT EXISTS idx_subcontractors_directory_id
+ON subcontractors (directory_id);
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_legal_name
+ON subcontractor_directory (legal_name);
+
+-- Backfill: subcontractors copied from the directory share its id
+UPDATE subcontractors s
+SET directory_id = d.id
+FROM subcontractor_directory d
+WHERE s.directory_id IS NULL
+AND d.id = s.id;
+
+-- Backfill the rest by exact legal name (oldest directory entry wins)
+UPDATE subcontractors s
+SET directory_id = d.id
+FROM (
+    SELECT DISTINCT ON (legal_name) id, legal_name
+    FROM subcontractor_directory
+    ORDER BY legal_name, created_at, id
+) d
+WHERE s.directory_id IS NULL
+AND d.legal_name = s.legal_name;
@@ -0,0 +1,12 @@
+-- Migration: Add input_fingerprint column to validation_results table
+-- Description: Stores a hash of each rule's inputs so unchanged rules can be skipped on revalidation
+
+ALTER TABLE validation_results
+ADD COLUMN IF NOT EXISTS input_fingerprint VARCHAR(64);
+
+COMMENT ON COLUMN validation_results.input_fingerprint IS
+'SHA-256 of the inputs the rule read when this result was produced; results with a NULL fingerprint are always recomputed';
+
+-- Incremental revalidation reads all results for a bid
+CREATE INDEX IF NOT EXISTS idx_validation_results_bid_id
+ON validation_results (bid_id);
@@ -25,6 +25,8 @@ class Settings(BaseSettings):
         return self.DATABASE_URL_LOCAL
 
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
+    # Serve get_matching_subcontractors from the in-process directory bitmap index
+    DIRECTORY_MATCH_INDEX: bool = os.getenv("DIRECTORY_MATCH_INDEX", "False").lower() == "true"
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "ComplyForm API"
 
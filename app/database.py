@@ -1,12 +1,13 @@
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from app.config import settings
 import logging
 
-# Setup logging
+# Setup logging (SQL statement logging is controlled by echo=settings.DEBUG below)
 logging.basicConfig()
-logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
 
 # Detect connection type
 IS_SUPABASE = "supabase.com" in settings.DATABASE_URL
@@ -75,6 +76,18 @@ def get_db():
     finally:
         db.close()
 
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement; scalar() returns the JSON plan"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    # Compiled through SQLAlchemy so bind parameters (JSONB, arrays) are processed as usual
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
 def test_connection():
     """Test database connection on startup"""
     try:
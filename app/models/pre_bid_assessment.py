@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Numeric, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Numeric, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,10 @@ from app.database import Base
 
 class PreBidAssessment(Base):
     __tablename__ = "pre_bid_assessments"
+    __table_args__ = (
+        # Per-organization listing, summary and monthly breakdown (add_assessment_summary_index.sql)
+        Index("idx_pre_bid_assessments_org_assessed_at", "organization_id", "assessed_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"))
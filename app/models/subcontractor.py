@@ -13,6 +13,13 @@ class Subcontractor(Base):
     legal_name = Column(String(255), nullable=False)
     certification_number = Column(String(100))
     is_mbe = Column(Boolean, default=False)
+    # Directory entry this subcontractor was copied from (validation looks up by this before legal_name)
+    directory_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("subcontractor_directory.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
     
     # Relationships
     organization = relationship("Organization", back_populates="subcontractors")
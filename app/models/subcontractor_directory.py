@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Boolean, Integer, Numeric, DateTime, Text
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, Integer, Numeric, DateTime, Text, Computed, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import uuid
 
@@ -10,7 +10,7 @@ class SubcontractorDirectory(Base):
     __tablename__ = "subcontractor_directory"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    legal_name = Column(String(255), nullable=False)
+    legal_name = Column(String(255), nullable=False, index=True)
     federal_id = Column(String(20))
     certifications = Column(JSONB)  # {mbe: true, vsbe: true, dbe: false}
     jurisdiction_codes = Column(ARRAY(Text))  # ['MD', 'DC']
@@ -24,6 +24,39 @@ class SubcontractorDirectory(Base):
     contractors_using_count = Column(Integer, default=0)  # Network effect: how many contractors use this sub
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Weighted full-text document for ranked search (see add_directory_search.sql);
+    # deferred, so entity queries do not select it and it is only used in SQL expressions
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(legal_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(capabilities, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(location_city, '')), 'C')",
+            persisted=True
+        )
+    ))
     
     # Relationships
-    outreach = relationship("SubcontractorOutreach", back_populates="subcontractor")
\ No newline at end of file
+    outreach = relationship("SubcontractorOutreach", back_populates="subcontractor")
+
+    # The pg_trgm index on legal_name is created by add_directory_search.sql
+    __table_args__ = (
+        Index("idx_subcontractor_directory_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination order for directory search (add_directory_search_pagination.sql)
+        Index(
+            "idx_subcontractor_directory_search_order",
+            text("(coalesce(rating, 0)) DESC"),
+            text("(coalesce(projects_completed, 0)) DESC"),
+            text("id DESC")
+        ),
+        # Array overlap/containment and certification containment filters
+        # (add_directory_filter_indexes.sql)
+        Index("idx_subcontractor_directory_jurisdiction_codes", jurisdiction_codes, postgresql_using="gin"),
+        Index("idx_subcontractor_directory_naics_codes", naics_codes, postgresql_using="gin"),
+        Index(
+            "idx_subcontractor_directory_certifications",
+            certifications,
+            postgresql_using="gin",
+            postgresql_ops={"certifications": "jsonb_path_ops"}
+        ),
+    )
\ No newline at end of file
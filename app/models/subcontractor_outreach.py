@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, Text, ForeignKey
+from sqlalchemy import Column, String, Date, Text, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -20,4 +20,14 @@ class SubcontractorOutreach(Base):
     # Relationships
     organization = relationship("Organization")
     opportunity = relationship("Opportunity", back_populates="outreach")
-    subcontractor = relationship("SubcontractorDirectory", back_populates="outreach")
\ No newline at end of file
+    subcontractor = relationship("SubcontractorDirectory", back_populates="outreach")
+
+    __table_args__ = (
+        # Serves the usage count delta probe and recount (add_outreach_usage_index.sql)
+        Index("idx_subcontractor_outreach_subcontractor_org", "subcontractor_id", "organization_id"),
+        # One record per organization, opportunity and subcontractor (add_outreach_unique_constraint.sql)
+        UniqueConstraint(
+            "organization_id", "opportunity_id", "subcontractor_id",
+            name="uq_subcontractor_outreach_org_opportunity_sub"
+        ),
+    )
@@ -14,6 +14,7 @@ class ValidationResult(Base):
     rule_name = Column(String(255))
     status = Column(String(20))  # PASS, FAIL, WARNING
     error_message = Column(Text)
+    input_fingerprint = Column(String(64), nullable=True)  # Hash of the rule inputs, for incremental revalidation
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
@@ -8,7 +8,9 @@ from app.schemas.pre_bid_assessment import (
     PreBidAssessment,
     PreBidAssessmentCreate,
     PreBidAssessmentDetail,
-    AssessmentRequest
+    AssessmentRequest,
+    BatchAssessmentRequest,
+    AssessmentResultCacheStats
 )
 from app.services import PreBidAssessmentService
 
@@ -29,6 +31,10 @@ def perform_assessment(
     - Recommendation (BID, CAUTION, NO_BID)
     - Matching subcontractors
     - Risk factors
+
+    With use_cache the last evaluation is reused while nothing it depends on
+    changed (only the due date factor is recomputed); with skip_unchanged the
+    latest saved assessment is returned instead of saving an identical row.
     """
     service = PreBidAssessmentService(db)
 
@@ -50,6 +56,41 @@ def perform_assessment(
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post("/perform/batch")
+def perform_batch_assessment(
+    request: BatchAssessmentRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Perform pre-bid assessments for many opportunities at once
+
+    Takes opportunity_ids and/or opportunity search filters. The organization
+    network and directory candidates are loaded once for the whole batch and
+    all assessments are saved together. Each entry in "assessments" matches
+    the POST /perform response; opportunities that cannot be assessed are
+    listed in "skipped" with a reason.
+    """
+    service = PreBidAssessmentService(db)
+
+    try:
+        return service.perform_batch_assessment(request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/cache/stats", response_model=AssessmentResultCacheStats)
+def get_assessment_cache_stats(db: Session = Depends(get_db)):
+    """
+    Hit/miss counters of the assessment result cache
+
+    Used by POST /perform with use_cache; an entry is reused only while the
+    organization network, directory and opportunity are unchanged.
+    """
+    service = PreBidAssessmentService(db)
+    return service.get_result_cache_stats()
+
 @router.get("/{assessment_id}", response_model=PreBidAssessment)
 def get_assessment(
     assessment_id: UUID,
@@ -79,6 +120,7 @@ def get_organization_assessments(
 @router.get("/organization/{organization_id}/summary")
 def get_assessment_summary(
     organization_id: UUID,
+    include_monthly: bool = Query(False, description="Add per-month figures"),
     db: Session = Depends(get_db)
 ):
     """
@@ -88,6 +130,10 @@ def get_assessment_summary(
     - Total assessments performed
     - Count by recommendation (BID, CAUTION, NO_BID)
     - Average risk score
+    - With include_monthly, the same figures per month (oldest first)
     """
     service = PreBidAssessmentService(db)
-    return service.get_assessment_summary_by_organization(organization_id)
\ No newline at end of file
+    return service.get_assessment_summary_by_organization(
+        organization_id,
+        include_monthly=include_monthly
+    )
\ No newline at end of file
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
+import json
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.schemas.bid import (
     Bid, 
     BidCreate, 
@@ -11,7 +13,11 @@ from app.schemas.bid import (
     BidSubcontractorCreate,
     BidSubcontractor
 )
-from app.schemas.validation import ValidationResponse
+from app.schemas.validation import (
+    ValidationResponse,
+    BatchValidationRequest,
+    ValidationPreviewRequest
+)
 from app.services import BidService, ValidationService
 
 router = APIRouter(prefix="/bids", tags=["bids"])
@@ -31,6 +37,60 @@ def list_bids(
     service = BidService(db)
     return service.get_all_bids(organization_id)
 
+@router.post("/validate/batch")
+def validate_bids_batch(request: BatchValidationRequest):
+    """
+    Validate many bids in one pass (by bid IDs and/or organization)
+
+    Streams newline-delimited JSON: one summary per bid as it is validated,
+    then a final line with totals once all results have been saved.
+    """
+    if not request.bid_ids and not request.organization_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide bid_ids or organization_id"
+        )
+
+    def stream():
+        # The request-scoped session is closed before a streaming body runs,
+        # so the stream owns its session
+        db = SessionLocal()
+        try:
+            validation_service = ValidationService(db)
+            for summary in validation_service.validate_bids_stream(
+                bid_ids=request.bid_ids,
+                organization_id=request.organization_id
+            ):
+                yield json.dumps(summary) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/validate/preview", response_model=ValidationResponse)
+def preview_bid_validation(
+    request: ValidationPreviewRequest,
+    trace: bool = Query(False, description="Include per-rule decision records in the response"),
+    db: Session = Depends(get_db)
+):
+    """
+    Validate an unsaved bid and team (what-if) without writing anything
+
+    Runs the same rules as /bids/{bid_id}/validate in memory; no bid,
+    subcontractor or validation result rows are created.
+    """
+    validation_service = ValidationService(db)
+
+    try:
+        return validation_service.preview_bid(
+            request.bid, request.subcontractors, trace=trace
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
 @router.get("/{bid_id}", response_model=BidDetail)
 def get_bid(bid_id: UUID, db: Session = Depends(get_db)):
     """Get a specific bid with all details"""
@@ -91,7 +151,12 @@ def remove_subcontractor_from_bid(
     return {"message": "Subcontractor removed successfully"}
 
 @router.get("/{bid_id}/validate", response_model=ValidationResponse)
-def validate_bid(bid_id: UUID, db: Session = Depends(get_db)):
+def validate_bid(
+    bid_id: UUID,
+    trace: bool = Query(False, description="Include per-rule decision records in the response"),
+    incremental: bool = Query(True, description="Only rerun rules whose inputs changed since the last validation"),
+    db: Session = Depends(get_db)
+):
     """Validate a bid and return results"""
     bid_service = BidService(db)
     validation_service = ValidationService(db)
@@ -104,4 +169,6 @@ def validate_bid(bid_id: UUID, db: Session = Depends(get_db)):
             detail=f"Bid {bid_id} not found"
         )
     
-    return validation_service.validate_bid(bid_id)
\ No newline at end of file
+    return validation_service.validate_bid(
+        bid_id, trace=trace, incremental=incremental
+    )
\ No newline at end of file
@@ -8,7 +8,8 @@ from app.schemas.compliance_rule import (
     ComplianceRule,
     ComplianceRuleCreate,
     ComplianceRuleUpdate,
-    ComplianceRuleDetail
+    ComplianceRuleDetail,
+    ComplianceRuleCacheStats
 )
 from app.services.compliance_rule_service import ComplianceRuleService
 
@@ -26,7 +27,8 @@ def create_compliance_rule(
     - MBE: Minority Business Enterprise requirements
     - VSBE: Very Small Business Enterprise requirements
     - DBE: Disadvantaged Business Enterprise requirements
-    - LOCAL_PREF: Local business preference requirements
+    - LOCAL_PREF: Local business preference requirements (threshold = minimum % of the bid
+      total awarded to subcontractors whose directory entry lists the rule's jurisdiction)
     
     Severity levels:
     - ERROR: Must be met (validation fails)
@@ -47,6 +49,17 @@ def list_compliance_rules(db: Session = Depends(get_db)):
     service = ComplianceRuleService(db)
     return service.get_all_rules()
 
+@router.get("/cache/stats", response_model=ComplianceRuleCacheStats)
+def get_compliance_rule_cache_stats(db: Session = Depends(get_db)):
+    """
+    Hit/miss counters of the compliance rule cache
+
+    Rules are cached per jurisdiction code and shared by these routes and
+    bid validation; any rule or jurisdiction write invalidates the cache.
+    """
+    service = ComplianceRuleService(db)
+    return service.get_cache_stats()
+
 @router.get("/{rule_id}", response_model=ComplianceRuleDetail)
 def get_compliance_rule(
     rule_id: UUID,
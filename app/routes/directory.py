@@ -9,7 +9,9 @@ from app.schemas.subcontractor_directory import (
     SubcontractorDirectory,
     SubcontractorDirectoryCreate,
     SubcontractorDirectoryUpdate,
-    SubcontractorSearchFilters
+    SubcontractorSearchFilters,
+    SubcontractorSearchPage,
+    DirectoryMatchIndexStats
 )
 from app.services import SubcontractorDirectoryService
 
@@ -34,7 +36,7 @@ def list_directory(
     service = SubcontractorDirectoryService(db)
     return service.get_all_subcontractors(skip=skip, limit=limit)
 
-@router.post("/search", response_model=List[SubcontractorDirectory])
+@router.post("/search", response_model=SubcontractorSearchPage)
 def search_directory(
     filters: SubcontractorSearchFilters,
     db: Session = Depends(get_db)
@@ -44,17 +46,31 @@ def search_directory(
     
     Filters include:
     - query: Text search on legal name
+    - ranked: Rank query matches by relevance over legal name, capabilities and
+      city, tolerating typos in the name
     - jurisdiction_codes: Filter by jurisdictions (e.g., ['MD', 'DC'])
     - naics_codes: Filter by NAICS codes
     - is_mbe: Filter by MBE certification
     - is_vsbe: Filter by VSBE certification
     - is_verified: Filter by verification status
     - min_rating: Minimum rating (0.0 - 5.0)
+    - limit: Page size (max 200)
+    - cursor: next_cursor from the previous page
     """
     service = SubcontractorDirectoryService(db)
-    return service.search_subcontractors(filters)
+    return _search_page(service, filters)
 
-@router.get("/search/simple", response_model=List[SubcontractorDirectory])
+def _search_page(service: SubcontractorDirectoryService, filters: SubcontractorSearchFilters):
+    """Run a paginated search, turning a bad cursor into a 400"""
+    try:
+        return service.search_subcontractors(filters)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/search/simple", response_model=SubcontractorSearchPage)
 def simple_search(
     q: Optional[str] = Query(None, description="Search query"),
     jurisdiction: Optional[str] = Query(None, description="Jurisdiction code (e.g., 'MD')"),
@@ -63,6 +79,9 @@ def simple_search(
     is_vsbe: Optional[bool] = Query(None, description="Filter by VSBE status"),
     is_verified: Optional[bool] = Query(None, description="Filter by verified status"),
     min_rating: Optional[float] = Query(None, ge=0.0, le=5.0, description="Minimum rating"),
+    ranked: bool = Query(False, description="Relevance-ranked full-text search with typo tolerance"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
     """Simple search with query parameters"""
@@ -73,11 +92,25 @@ def simple_search(
         is_mbe=is_mbe,
         is_vsbe=is_vsbe,
         is_verified=is_verified,
-        min_rating=Decimal(str(min_rating)) if min_rating is not None else None
+        min_rating=Decimal(str(min_rating)) if min_rating is not None else None,
+        ranked=ranked,
+        limit=limit,
+        cursor=cursor
     )
     
     service = SubcontractorDirectoryService(db)
-    return service.search_subcontractors(filters)
+    return _search_page(service, filters)
+
+@router.get("/match-index/stats", response_model=DirectoryMatchIndexStats)
+def get_match_index_stats(db: Session = Depends(get_db)):
+    """
+    Counters of the in-process directory match index
+
+    When enabled (DIRECTORY_MATCH_INDEX=true), opportunity matching is served
+    from per-value bitmaps over the directory, kept current by directory writes.
+    """
+    service = SubcontractorDirectoryService(db)
+    return service.get_match_index_stats()
 
 @router.get("/{subcontractor_id}", response_model=SubcontractorDirectory)
 def get_directory_entry(
@@ -186,16 +219,20 @@ def update_usage_count(
 
 @router.post("/update-all-usage-counts")
 def update_all_usage_counts(
+    chunk_size: Optional[int] = Query(None, ge=1, description="Entries per UPDATE, committed separately; all at once if omitted"),
     db: Session = Depends(get_db)
 ):
     """
     Update contractor usage counts for all subcontractors in the directory.
     This is useful for batch updates or after importing data.
+
+    Runs as one set-based UPDATE (or one per chunk_size entries) and reports
+    how many counts changed and how long it took.
     """
     service = SubcontractorDirectoryService(db)
-    updated_count = service.update_all_contractor_usage_counts()
+    result = service.update_all_contractor_usage_counts(chunk_size=chunk_size)
 
     return {
         "message": "Successfully updated contractor usage counts",
-        "updated_count": updated_count
+        **result
     }
\ No newline at end of file
@@ -9,7 +9,8 @@ from app.schemas.opportunity import (
     Opportunity,
     OpportunityCreate,
     OpportunityDetail,
-    OpportunitySearchFilters
+    OpportunitySearchFilters,
+    OpportunityScoredSearch
 )
 from app.services import OpportunityService
 
@@ -53,6 +54,25 @@ def search_opportunities(
     service = OpportunityService(db)
     return service.search_opportunities(filters)
 
+@router.post("/search/scored", response_model=List[OpportunityDetail])
+def scored_search_opportunities(
+    search: OpportunityScoredSearch,
+    db: Session = Depends(get_db)
+):
+    """
+    Search opportunities ranked by relevance to an organization
+
+    Takes the same filters as /search plus:
+    - organization_naics / organization_jurisdictions: Profile to score against
+    - min_relevance: Minimum relevance score (0-100)
+    - skip / limit: Page through the ranked results (limit max 500)
+
+    Scoring, ordering and paging run in the database (same rubric as
+    /alerts/relevant); relevance_score holds each opportunity's score.
+    """
+    service = OpportunityService(db)
+    return service.scored_search_opportunities(search)
+
 @router.get("/search/simple", response_model=List[OpportunityDetail])
 def simple_search_opportunities(
     jurisdiction: Optional[str] = Query(None, description="Jurisdiction code"),
@@ -142,30 +162,19 @@ def get_relevant_opportunities(
     organization_naics: List[str] = Query(..., description="Organization NAICS codes"),
     organization_jurisdictions: List[str] = Query(..., description="Organization jurisdictions"),
     min_relevance: int = Query(50, ge=0, le=100, description="Minimum relevance score"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of opportunities (highest scores first)"),
     db: Session = Depends(get_db)
 ):
     """
     Get opportunities relevant to an organization based on NAICS and jurisdiction
     This powers the opportunity alerts feature
+
+    Every active opportunity is scored; the top `limit` by relevance are returned.
     """
     service = OpportunityService(db)
-    
-    # Get all active opportunities
-    opportunities = service.get_all_opportunities(is_active=True)
-    
-    # Calculate relevance scores and filter
-    relevant_opportunities = []
-    for opp in opportunities:
-        score = service.calculate_relevance_score(
-            opp,
-            organization_naics,
-            organization_jurisdictions
-        )
-        if score >= min_relevance:
-            opp.relevance_score = score
-            relevant_opportunities.append(opp)
-    
-    # Sort by relevance score
-    relevant_opportunities.sort(key=lambda x: x.relevance_score, reverse=True)
-    
-    return relevant_opportunities
\ No newline at end of file
+    return service.get_relevant_opportunities(
+        organization_naics,
+        organization_jurisdictions,
+        min_relevance=min_relevance,
+        limit=limit
+    )
\ No newline at end of file
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.database import get_db
 from app.models import Organization, Subcontractor
 from app.schemas.organization import Organization as OrgSchema, OrganizationCreate
-from app.schemas.subcontractor import SubcontractorDetail
+from app.schemas.subcontractor import (
+    SubcontractorDetail,
+    NetworkCapacity,
+    NetworkCapacityIndexStats
+)
+from app.services import SubcontractorService
+from app.services.subcontractor_service import network_capacity_index
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
@@ -27,6 +33,17 @@ def list_organizations(db: Session = Depends(get_db)):
     """List all organizations"""
     return db.query(Organization).all()
 
+@router.get("/network-capacity/stats", response_model=NetworkCapacityIndexStats)
+def get_network_capacity_stats():
+    """
+    Hit/miss counters of the network capacity index
+
+    Network capacity is cached per organization and shared by pre-bid
+    assessments and the network capacity endpoint; subcontractor writes
+    invalidate the organization's entry.
+    """
+    return network_capacity_index.stats()
+
 @router.get("/{organization_id}", response_model=OrgSchema)
 def get_organization(
     organization_id: UUID,
@@ -74,4 +91,29 @@ def get_organization_network(
         Subcontractor.organization_id == organization_id
     ).all()
 
-    return subcontractors
\ No newline at end of file
+    return subcontractors
+
+@router.get("/{organization_id}/network/capacity", response_model=NetworkCapacity)
+def get_organization_network_capacity(
+    organization_id: UUID,
+    cert_type: str = Query(..., description="Certification type, e.g. MBE or VSBE"),
+    naics_codes: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Count an organization's network subcontractors toward a certification type
+
+    Uses the same rules as pre-bid assessments: a certification whose type
+    contains cert_type and that lists one of the NAICS codes (or none), plus
+    the is_mbe flag for MBE. Served from the cached network capacity index.
+    """
+    org = db.query(Organization).filter(Organization.id == organization_id).first()
+
+    if not org:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Organization {organization_id} not found"
+        )
+
+    service = SubcontractorService(db)
+    return service.get_network_capacity(organization_id, cert_type, naics_codes)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
@@ -21,7 +21,14 @@ def create_outreach(
 ):
     """Record a new subcontractor outreach"""
     service = SubcontractorOutreachService(db)
-    return service.create_outreach(outreach)
+
+    try:
+        return service.create_outreach(outreach)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/{outreach_id}", response_model=SubcontractorOutreachDetail)
 def get_outreach(
@@ -105,6 +112,7 @@ def delete_outreach(
 @router.get("/statistics/opportunity/{opportunity_id}")
 def get_opportunity_outreach_stats(
     opportunity_id: UUID,
+    include_weekly: bool = Query(False, description="Add per-week counts by contact date"),
     db: Session = Depends(get_db)
 ):
     """
@@ -115,13 +123,18 @@ def get_opportunity_outreach_stats(
     - Count by status (CONTACTED, RESPONDED, COMMITTED, DECLINED)
     - Response rate
     - Commitment rate
+    - With include_weekly: the same counts per week of contact date
     """
     service = SubcontractorOutreachService(db)
-    return service.get_outreach_statistics(opportunity_id=opportunity_id)
+    return service.get_outreach_statistics(
+        opportunity_id=opportunity_id,
+        include_weekly=include_weekly
+    )
 
 @router.get("/statistics/organization/{organization_id}")
 def get_organization_outreach_stats(
     organization_id: UUID,
+    include_weekly: bool = Query(False, description="Add per-week counts by contact date"),
     db: Session = Depends(get_db)
 ):
     """
@@ -132,9 +145,13 @@ def get_organization_outreach_stats(
     - Count by status (CONTACTED, RESPONDED, COMMITTED, DECLINED)
     - Response rate
     - Commitment rate
+    - With include_weekly: the same counts per week of contact date
     """
     service = SubcontractorOutreachService(db)
-    return service.get_outreach_statistics(organization_id=organization_id)
+    return service.get_outreach_statistics(
+        organization_id=organization_id,
+        include_weekly=include_weekly
+    )
 
 @router.post("/bulk-create", response_model=List[SubcontractorOutreach], status_code=status.HTTP_201_CREATED)
 def bulk_create_outreach(
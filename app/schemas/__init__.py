@@ -2,7 +2,9 @@ from app.schemas.organization import Organization, OrganizationCreate
 from app.schemas.subcontractor import (
     Subcontractor, 
     SubcontractorCreate, 
-    SubcontractorDetail
+    SubcontractorDetail,
+    NetworkCapacity,
+    NetworkCapacityIndexStats
 )
 from app.schemas.bid import (
     Bid, 
@@ -11,31 +13,44 @@ from app.schemas.bid import (
     BidSubcontractorCreate,
     BidSubcontractor
 )
-from app.schemas.validation import ValidationResult, ValidationResponse
+from app.schemas.validation import (
+    ValidationResult,
+    ValidationResponse,
+    ValidationTraceRecord,
+    ValidationSummary,
+    BatchValidationRequest,
+    ValidationPreviewRequest
+)
 from app.schemas.jurisdiction import Jurisdiction, JurisdictionCreate
 from app.schemas.compliance_rule import (
     ComplianceRule,
     ComplianceRuleCreate,
     ComplianceRuleUpdate,
-    ComplianceRuleDetail
+    ComplianceRuleDetail,
+    ComplianceRuleCacheStats
 )
 from app.schemas.subcontractor_directory import (
     SubcontractorDirectory,
     SubcontractorDirectoryCreate,
     SubcontractorDirectoryUpdate,
-    SubcontractorSearchFilters
+    SubcontractorSearchFilters,
+    SubcontractorSearchPage,
+    DirectoryMatchIndexStats
 )
 from app.schemas.opportunity import (
     Opportunity,
     OpportunityCreate,
     OpportunityDetail,
-    OpportunitySearchFilters
+    OpportunitySearchFilters,
+    OpportunityScoredSearch
 )
 from app.schemas.pre_bid_assessment import (
     PreBidAssessment,
     PreBidAssessmentCreate,
     PreBidAssessmentDetail,
-    AssessmentRequest
+    AssessmentRequest,
+    BatchAssessmentRequest,
+    AssessmentResultCacheStats
 )
 from app.schemas.subcontractor_outreach import (
     SubcontractorOutreach,
@@ -50,6 +65,8 @@ __all__ = [
     "Subcontractor",
     "SubcontractorCreate",
     "SubcontractorDetail",
+    "NetworkCapacity",
+    "NetworkCapacityIndexStats",
     "Bid",
     "BidCreate",
     "BidDetail",
@@ -57,24 +74,34 @@ __all__ = [
     "BidSubcontractor",
     "ValidationResult",
     "ValidationResponse",
+    "ValidationTraceRecord",
+    "ValidationSummary",
+    "BatchValidationRequest",
+    "ValidationPreviewRequest",
     "Jurisdiction",
     "JurisdictionCreate",
     "ComplianceRule",
     "ComplianceRuleCreate",
     "ComplianceRuleUpdate",
     "ComplianceRuleDetail",
+    "ComplianceRuleCacheStats",
     "SubcontractorDirectory",
     "SubcontractorDirectoryCreate",
     "SubcontractorDirectoryUpdate",
     "SubcontractorSearchFilters",
+    "SubcontractorSearchPage",
+    "DirectoryMatchIndexStats",
     "Opportunity",
     "OpportunityCreate",
     "OpportunityDetail",
     "OpportunitySearchFilters",
+    "OpportunityScoredSearch",
     "PreBidAssessment",
     "PreBidAssessmentCreate",
     "PreBidAssessmentDetail",
     "AssessmentRequest",
+    "BatchAssessmentRequest",
+    "AssessmentResultCacheStats",
     "SubcontractorOutreach",
     "SubcontractorOutreachCreate",
     "SubcontractorOutreachUpdate",
@@ -29,4 +29,14 @@ class ComplianceRuleDetail(ComplianceRule):
     jurisdiction: Optional[Jurisdiction] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ComplianceRuleCacheStats(BaseModel):
+    """Counters of the in-process compliance rule cache"""
+    version: int
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    invalidations: int
+    max_age_seconds: float
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from typing import Optional, List
 from decimal import Decimal
@@ -42,6 +42,14 @@ class OpportunitySearchFilters(BaseModel):
     is_active: Optional[bool] = True
     days_until_due: Optional[int] = None
 
+class OpportunityScoredSearch(OpportunitySearchFilters):
+    """Search filters plus the organization profile the results are ranked for"""
+    organization_naics: List[str] = []
+    organization_jurisdictions: List[str] = []
+    min_relevance: int = Field(0, ge=0, le=100)
+    skip: int = Field(0, ge=0)
+    limit: int = Field(50, ge=1, le=500)
+
 # Avoid circular import
 from app.schemas.jurisdiction import Jurisdiction as JurisdictionSchema
 OpportunityDetail.model_rebuild()
\ No newline at end of file
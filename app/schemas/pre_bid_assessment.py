@@ -1,8 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
+from app.schemas.opportunity import OpportunitySearchFilters
 
 class PreBidAssessmentBase(BaseModel):
     organization_id: UUID
@@ -36,6 +37,28 @@ class AssessmentRequest(BaseModel):
     opportunity_id: UUID
     organization_id: UUID
     estimated_subcontract_percentage: Optional[Decimal] = 30.0
+    # Reuse the last evaluation while the network, directory and opportunity are unchanged
+    use_cache: bool = False
+    # Return the latest saved assessment instead of saving an identical one
+    skip_unchanged: bool = False
+
+class BatchAssessmentRequest(BaseModel):
+    """Assess a list of opportunities, or those matching search filters, for one organization"""
+    organization_id: UUID
+    opportunity_ids: Optional[List[UUID]] = Field(None, max_length=1000)
+    filters: Optional[OpportunitySearchFilters] = None
+    # Opportunities assessed per request, soonest due first; further listed
+    # opportunity_ids are returned in "skipped" as exceeding the limit
+    limit: int = Field(100, ge=1, le=500)
+
+class AssessmentResultCacheStats(BaseModel):
+    """Counters of the in-process assessment result cache"""
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    max_entries: int
+    max_age_seconds: float
 
 # Avoid circular imports
 from app.schemas.opportunity import Opportunity as OpportunitySchema
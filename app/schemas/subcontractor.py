@@ -30,4 +30,22 @@ class SubcontractorDetail(Subcontractor):
     certifications: List[CertificationSchema] = []
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class NetworkCapacity(BaseModel):
+    """Network subcontractors counting toward a certification type"""
+    organization_id: UUID
+    cert_type: str
+    naics_codes: List[str] = []
+    count: int
+    subcontractor_ids: List[UUID]
+
+class NetworkCapacityIndexStats(BaseModel):
+    """Counters of the in-process network capacity index"""
+    version: int
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    invalidations: int
+    max_age_seconds: float
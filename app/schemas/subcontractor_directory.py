@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 from uuid import UUID
 from typing import Optional, List, Dict
 from decimal import Decimal
@@ -49,6 +49,12 @@ class SubcontractorDirectory(SubcontractorDirectoryBase):
     class Config:
         from_attributes = True
 
+class SubcontractorSearchPage(BaseModel):
+    """One page of directory search results"""
+    items: List[SubcontractorDirectory]
+    next_cursor: Optional[str] = None  # Pass back as cursor for the next page; null on the last page
+    total_estimate: Optional[int] = None  # Planner estimate of all matching rows (first page only), not an exact count
+
 class SubcontractorSearchFilters(BaseModel):
     query: Optional[str] = None
     jurisdiction_codes: Optional[List[str]] = None
@@ -56,4 +62,21 @@ class SubcontractorSearchFilters(BaseModel):
     is_mbe: Optional[bool] = None
     is_vsbe: Optional[bool] = None
     is_verified: Optional[bool] = None
-    min_rating: Optional[Decimal] = None
\ No newline at end of file
+    min_rating: Optional[Decimal] = None
+    # Rank query matches by full-text relevance over name, capabilities and city,
+    # with typo-tolerant name matching, instead of a legal name substring match
+    ranked: bool = False
+    # Keyset pagination (page size is capped at 200)
+    limit: int = Field(50, ge=1, le=200)
+    cursor: Optional[str] = None
+
+class DirectoryMatchIndexStats(BaseModel):
+    """Counters of the in-process directory match index"""
+    enabled: bool
+    loaded: bool
+    entries: int
+    naics_codes: int
+    jurisdiction_codes: int
+    loads: int
+    matches: int
+    max_age_seconds: float
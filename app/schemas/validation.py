@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 from uuid import UUID
-from typing import List
+from typing import List, Optional, Dict, Any
 from datetime import datetime
+from app.schemas.bid import BidCreate, BidSubcontractorCreate
 
 class ValidationResult(BaseModel):
     id: UUID
@@ -14,6 +15,28 @@ class ValidationResult(BaseModel):
     class Config:
         from_attributes = True
 
+class ValidationTraceRecord(BaseModel):
+    rule_name: str
+    subject: Optional[str] = None
+    message: str
+    details: Dict[str, Any] = {}
+
+class ValidationSummary(BaseModel):
+    bid_id: UUID
+    overall_status: str
+    total_validations: int
+    passed: int
+    failed: int
+    warnings: int
+
+class BatchValidationRequest(BaseModel):
+    bid_ids: Optional[List[UUID]] = None
+    organization_id: Optional[UUID] = None
+
+class ValidationPreviewRequest(BaseModel):
+    bid: BidCreate
+    subcontractors: List[BidSubcontractorCreate] = []
+
 class ValidationResponse(BaseModel):
     bid_id: UUID
     overall_status: str
@@ -21,4 +44,6 @@ class ValidationResponse(BaseModel):
     passed: int
     failed: int
     warnings: int
-    validations: List[ValidationResult]
\ No newline at end of file
+    validations: List[ValidationResult]
+    trace: Optional[List[ValidationTraceRecord]] = None
+    rule_timings_ms: Optional[Dict[str, float]] = None
\ No newline at end of file
@@ -1,8 +1,11 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
+import uuid
+from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy.orm import Session, joinedload
 from app.models import Bid, BidSubcontractor, Subcontractor, SubcontractorDirectory
 from app.schemas.bid import BidCreate, BidSubcontractorCreate
+from app.services.subcontractor_service import network_capacity_index
 
 class BidService:
     """Service for bid operations"""
@@ -41,10 +44,11 @@ class BidService:
             SubcontractorDirectory.id == subcontractor_id
         ).first() is not None
 
-    def _ensure_subcontractor_in_org(self, subcontractor_id: UUID, bid_id: UUID) -> None:
+    def _ensure_subcontractor_in_org(self, subcontractor_id: UUID, bid_id: UUID) -> Optional[UUID]:
         """
         Ensure subcontractor from directory exists in organization's subcontractors table.
         If not, copy it from the directory.
+        Returns the organization ID when a subcontractor was copied into its network.
         """
         # Check if already in organization's subcontractors
         existing = self.db.query(Subcontractor).filter(
@@ -71,22 +75,18 @@ class BidService:
         org_subcontractor = Subcontractor(
             id=directory_sub.id,  # Use same ID for consistency
             organization_id=bid.organization_id,
+            directory_id=directory_sub.id,
             legal_name=directory_sub.legal_name,
             certification_number=directory_sub.federal_id,
             is_mbe=directory_sub.certifications.get('mbe', False) if directory_sub.certifications else False
         )
         self.db.add(org_subcontractor)
         self.db.flush()  # Flush but don't commit yet
+        return bid.organization_id
 
-    def add_subcontractor_to_bid(
-        self,
-        bid_id: UUID,
-        subcontractor_data: BidSubcontractorCreate
-    ) -> BidSubcontractor:
-        """Add a subcontractor to a bid"""
-        # Ensure the subcontractor exists in the organization's table
-        self._ensure_subcontractor_in_org(subcontractor_data.subcontractor_id, bid_id)
-
+    @staticmethod
+    def _bid_subcontractor_data(subcontractor_data: BidSubcontractorCreate) -> Dict:
+        """Column values for a BidSubcontractor row"""
         # Convert category_breakdown to dict format for JSONB storage
         data_dict = subcontractor_data.model_dump()
         if data_dict.get('category_breakdown'):
@@ -95,13 +95,95 @@ class BidService:
                 {"category": entry.category.upper(), "percentage": entry.percentage}
                 for entry in subcontractor_data.category_breakdown
             ]
+        return data_dict
+
+    @staticmethod
+    def _as_stored(model, values: Dict) -> Dict:
+        """Round Decimal values to their Numeric column's scale, as the database would"""
+        columns = model.__table__.columns
+        for key, value in values.items():
+            scale = getattr(columns[key].type, "scale", None) if key in columns else None
+            if isinstance(value, Decimal) and scale is not None:
+                values[key] = value.quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+        return values
+
+    def build_preview_bid(
+        self,
+        bid_data: BidCreate,
+        subcontractors_data: List[BidSubcontractorCreate]
+    ) -> Bid:
+        """
+        Build an unsaved bid with its team, as add_subcontractor_to_bid would store it
+
+        Nothing is added to the session. Subcontractors are resolved from the
+        organization's table, falling back to the directory (as
+        _ensure_subcontractor_in_org does), with one query each.
+        Raises ValueError if a subcontractor exists in neither.
+        """
+        subcontractor_ids = {data.subcontractor_id for data in subcontractors_data}
+
+        # Detached copies, so the transient team never touches session state
+        resolved = {}
+        if subcontractor_ids:
+            for existing in self.db.query(Subcontractor).filter(
+                Subcontractor.id.in_(subcontractor_ids)
+            ).all():
+                resolved[existing.id] = Subcontractor(
+                    id=existing.id,
+                    organization_id=existing.organization_id,
+                    directory_id=existing.directory_id,
+                    legal_name=existing.legal_name,
+                    certification_number=existing.certification_number,
+                    is_mbe=existing.is_mbe
+                )
+
+        missing = subcontractor_ids - set(resolved)
+        if missing:
+            for directory_sub in self.db.query(SubcontractorDirectory).filter(
+                SubcontractorDirectory.id.in_(missing)
+            ).all():
+                resolved[directory_sub.id] = Subcontractor(
+                    id=directory_sub.id,
+                    organization_id=bid_data.organization_id,
+                    directory_id=directory_sub.id,
+                    legal_name=directory_sub.legal_name,
+                    certification_number=directory_sub.federal_id,
+                    is_mbe=directory_sub.certifications.get('mbe', False) if directory_sub.certifications else False
+                )
+
+        for subcontractor_id in subcontractor_ids:
+            if subcontractor_id not in resolved:
+                raise ValueError(f"Subcontractor {subcontractor_id} not found")
+
+        bid = Bid(id=uuid.uuid4(), **self._as_stored(Bid, bid_data.model_dump()))
+        bid.bid_subcontractors = [
+            BidSubcontractor(
+                id=uuid.uuid4(),
+                bid_id=bid.id,
+                subcontractor=resolved[data.subcontractor_id],
+                **self._as_stored(BidSubcontractor, self._bid_subcontractor_data(data))
+            )
+            for data in subcontractors_data
+        ]
+        return bid
+
+    def add_subcontractor_to_bid(
+        self,
+        bid_id: UUID,
+        subcontractor_data: BidSubcontractorCreate
+    ) -> BidSubcontractor:
+        """Add a subcontractor to a bid"""
+        # Ensure the subcontractor exists in the organization's table
+        added_to_organization = self._ensure_subcontractor_in_org(subcontractor_data.subcontractor_id, bid_id)
 
         bid_sub = BidSubcontractor(
             bid_id=bid_id,
-            **data_dict
+            **self._bid_subcontractor_data(subcontractor_data)
         )
         self.db.add(bid_sub)
         self.db.commit()
+        if added_to_organization:
+            network_capacity_index.invalidate(added_to_organization)
         self.db.refresh(bid_sub)
         return bid_sub
     
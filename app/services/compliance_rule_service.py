@@ -1,20 +1,110 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from app.models import ComplianceRule, Jurisdiction
-from app.schemas.compliance_rule import ComplianceRuleCreate, ComplianceRuleUpdate
+from app.schemas.compliance_rule import (
+    ComplianceRuleCreate,
+    ComplianceRuleUpdate,
+    ComplianceRuleDetail
+)
+from app.schemas.jurisdiction import Jurisdiction as JurisdictionSchema
+from app.validation.compliance import ComplianceEvaluator, compile_rules
+import threading
+import time
+
+# Cached value per jurisdiction code: the jurisdiction (None if the code is unknown),
+# its rules and the rules compiled into evaluators for validation
+CachedJurisdictionRules = Tuple[
+    Optional[JurisdictionSchema],
+    List[ComplianceRuleDetail],
+    List[ComplianceEvaluator]
+]
+
+class ComplianceRuleCache:
+    """
+    Process-wide cache of compliance rules per jurisdiction code
+
+    Rules change a few times a month but are read on every validation, so
+    they are kept as detached snapshots (pydantic schemas, safe to share
+    across sessions and threads). Every write through ComplianceRuleService
+    or JurisdictionService bumps the version and drops all entries; loads
+    that started before an invalidation are not stored. Entries also expire
+    after max_age_seconds so other worker processes pick up changes.
+    """
+
+    def __init__(self, max_age_seconds: float = 300):
+        self.max_age_seconds = max_age_seconds
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: Dict[str, Tuple[float, CachedJurisdictionRules]] = {}
+        self._codes_by_id: Dict[UUID, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, code: str) -> Optional[CachedJurisdictionRules]:
+        """Cached jurisdiction and rules for a code, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry and time.monotonic() - entry[0] < self.max_age_seconds:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def get_code(self, jurisdiction_id: UUID) -> Optional[str]:
+        """Jurisdiction code of a cached jurisdiction ID"""
+        with self._lock:
+            return self._codes_by_id.get(jurisdiction_id)
+
+    def put(self, code: str, value: CachedJurisdictionRules, version: int) -> None:
+        """Store a loaded value unless the cache was invalidated since loading began"""
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[code] = (time.monotonic(), value)
+            if value[0] is not None:
+                self._codes_by_id[value[0].id] = code
+
+    def invalidate(self) -> None:
+        """Drop every entry (called after any rule or jurisdiction write)"""
+        with self._lock:
+            self.version += 1
+            self.invalidations += 1
+            self._entries.clear()
+            self._codes_by_id.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "max_age_seconds": self.max_age_seconds
+            }
+
+
+# Shared by the compliance rule routes and the validation engine
+compliance_rule_cache = ComplianceRuleCache()
 
 class ComplianceRuleService:
     """Service for managing jurisdiction-specific compliance rules"""
     
     def __init__(self, db: Session):
         self.db = db
+        self.cache = compliance_rule_cache
     
     def create_rule(self, rule_data: ComplianceRuleCreate) -> ComplianceRule:
         """Create a new compliance rule"""
         rule = ComplianceRule(**rule_data.model_dump())
         self.db.add(rule)
         self.db.commit()
+        self.cache.invalidate()
         self.db.refresh(rule)
         return rule
     
@@ -27,27 +117,86 @@ class ComplianceRuleService:
     def get_rules_by_jurisdiction(
         self, 
         jurisdiction_id: UUID
-    ) -> List[ComplianceRule]:
-        """Get all compliance rules for a specific jurisdiction"""
-        return self.db.query(ComplianceRule).options(
-            joinedload(ComplianceRule.jurisdiction)
-        ).filter(
-            ComplianceRule.jurisdiction_id == jurisdiction_id
-        ).all()
+    ) -> List[ComplianceRuleDetail]:
+        """Get all compliance rules for a specific jurisdiction (cached)"""
+        code = self.cache.get_code(jurisdiction_id)
+
+        if code is None:
+            jurisdiction = self.db.query(Jurisdiction).filter(
+                Jurisdiction.id == jurisdiction_id
+            ).first()
+
+            if not jurisdiction:
+                return []
+
+            code = jurisdiction.code
+
+        return self.get_rules_by_jurisdiction_code(code)
     
     def get_rules_by_jurisdiction_code(
         self, 
         jurisdiction_code: str
-    ) -> List[ComplianceRule]:
-        """Get all compliance rules for a jurisdiction by code (e.g., 'MD', 'DC')"""
-        jurisdiction = self.db.query(Jurisdiction).filter(
-            Jurisdiction.code == jurisdiction_code
-        ).first()
-        
-        if not jurisdiction:
-            return []
-        
-        return self.get_rules_by_jurisdiction(jurisdiction.id)
+    ) -> List[ComplianceRuleDetail]:
+        """Get all compliance rules for a jurisdiction by code (e.g., 'MD', 'DC') (cached)"""
+        _, rules, _ = self.get_cached_jurisdictions([jurisdiction_code])[jurisdiction_code]
+        return rules
+
+    def get_cached_jurisdictions(
+        self,
+        jurisdiction_codes: Iterable[str]
+    ) -> Dict[str, CachedJurisdictionRules]:
+        """
+        Jurisdiction and compliance rules for each code, served from the cache
+
+        Codes missing from the cache are loaded together with two queries
+        (jurisdictions, then their rules), compiled and cached, including
+        unknown codes.
+        """
+        results = {}
+        missing = []
+
+        for code in jurisdiction_codes:
+            cached = self.cache.get(code)
+            if cached is None:
+                missing.append(code)
+            else:
+                results[code] = cached
+
+        if not missing:
+            return results
+
+        version = self.cache.version
+
+        jurisdictions = self.db.query(Jurisdiction).filter(
+            Jurisdiction.code.in_(missing)
+        ).all()
+
+        rules_by_jurisdiction = {jurisdiction.id: [] for jurisdiction in jurisdictions}
+        if jurisdictions:
+            for rule in self.db.query(ComplianceRule).options(
+                joinedload(ComplianceRule.jurisdiction)
+            ).filter(
+                ComplianceRule.jurisdiction_id.in_(list(rules_by_jurisdiction.keys()))
+            ).all():
+                rules_by_jurisdiction[rule.jurisdiction_id].append(
+                    ComplianceRuleDetail.model_validate(rule)
+                )
+
+        loaded = {
+            jurisdiction.code: (
+                JurisdictionSchema.model_validate(jurisdiction),
+                rules_by_jurisdiction[jurisdiction.id],
+                compile_rules(rules_by_jurisdiction[jurisdiction.id])
+            )
+            for jurisdiction in jurisdictions
+        }
+
+        for code in missing:
+            value = loaded.get(code, (None, [], []))
+            self.cache.put(code, value, version)
+            results[code] = value
+
+        return results
     
     def get_rules_by_type(
         self,
@@ -90,6 +239,7 @@ class ComplianceRuleService:
                 setattr(rule, key, value)
         
         self.db.commit()
+        self.cache.invalidate()
         self.db.refresh(rule)
         return rule
     
@@ -102,22 +252,25 @@ class ComplianceRuleService:
         
         self.db.delete(rule)
         self.db.commit()
+        self.cache.invalidate()
         return True
     
     def get_applicable_rules(
         self,
         jurisdiction_id: UUID,
         rule_types: Optional[List[str]] = None
-    ) -> List[ComplianceRule]:
+    ) -> List[ComplianceRuleDetail]:
         """
-        Get applicable compliance rules for a bid
+        Get applicable compliance rules for a bid (cached)
         Can filter by rule types (e.g., ['MBE', 'VSBE'])
         """
-        query = self.db.query(ComplianceRule).options(
-            joinedload(ComplianceRule.jurisdiction)
-        ).filter(ComplianceRule.jurisdiction_id == jurisdiction_id)
+        rules = self.get_rules_by_jurisdiction(jurisdiction_id)
         
         if rule_types:
-            query = query.filter(ComplianceRule.rule_type.in_(rule_types))
+            rules = [rule for rule in rules if rule.rule_type in rule_types]
         
-        return query.all()
\ No newline at end of file
+        return rules
+
+    def get_cache_stats(self) -> Dict:
+        """Hit/miss counters of the shared compliance rule cache"""
+        return self.cache.stats()
\ No newline at end of file
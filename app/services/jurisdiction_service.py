@@ -3,6 +3,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 from app.models import Jurisdiction
 from app.schemas.jurisdiction import JurisdictionCreate
+from app.services.compliance_rule_service import compliance_rule_cache
 
 class JurisdictionService:
     """Service for jurisdiction operations"""
@@ -15,6 +16,7 @@ class JurisdictionService:
         jurisdiction = Jurisdiction(**jurisdiction_data.model_dump())
         self.db.add(jurisdiction)
         self.db.commit()
+        compliance_rule_cache.invalidate()
         self.db.refresh(jurisdiction)
         return jurisdiction
     
@@ -50,5 +52,6 @@ class JurisdictionService:
                 setattr(jurisdiction, key, value)
         
         self.db.commit()
+        compliance_rule_cache.invalidate()
         self.db.refresh(jurisdiction)
         return jurisdiction
\ No newline at end of file
@@ -1,10 +1,78 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload, contains_eager
+from sqlalchemy import and_, or_, case
 from datetime import date, datetime, timedelta
+import heapq
 from app.models import Opportunity, Jurisdiction
-from app.schemas.opportunity import OpportunityCreate, OpportunitySearchFilters
+from app.schemas.opportunity import (
+    OpportunityCreate,
+    OpportunitySearchFilters,
+    OpportunityScoredSearch
+)
+
+# Relevance rubric (0-100): NAICS match 40, jurisdiction match 30,
+# value band 15 (5 below the band), due window 15 (8 near the window)
+NAICS_MATCH_POINTS = 40
+JURISDICTION_MATCH_POINTS = 30
+VALUE_BAND = (100000, 5000000)
+VALUE_BAND_POINTS = 15
+VALUE_BELOW_BAND_POINTS = 5
+DUE_WINDOW_DAYS = (14, 60)
+DUE_WINDOW_POINTS = 15
+DUE_NEAR_WINDOW_DAYS = (7, 90)
+DUE_NEAR_WINDOW_POINTS = 8
+
+def score_relevance(
+    naics_column: Sequence[Optional[List[str]]],
+    jurisdiction_column: Sequence[Optional[str]],
+    value_column: Sequence,
+    due_date_column: Sequence[Optional[date]],
+    organization_naics: Iterable[str],
+    organization_jurisdictions: Iterable[str],
+    today: Optional[date] = None
+) -> List[int]:
+    """
+    Relevance scores for a batch of opportunities given as parallel columns
+
+    Each rubric component is computed over a whole column with set lookups
+    and precomputed date bounds, then the columns are summed.
+    """
+    today = today or date.today()
+    organization_naics = set(organization_naics)
+    organization_jurisdictions = set(organization_jurisdictions)
+
+    naics_points = [
+        NAICS_MATCH_POINTS if codes and not organization_naics.isdisjoint(codes) else 0
+        for codes in naics_column
+    ]
+    jurisdiction_points = [
+        JURISDICTION_MATCH_POINTS if code in organization_jurisdictions else 0
+        for code in jurisdiction_column
+    ]
+    value_points = [
+        0 if not value
+        else VALUE_BAND_POINTS if VALUE_BAND[0] <= value <= VALUE_BAND[1]
+        else VALUE_BELOW_BAND_POINTS if value < VALUE_BAND[0]
+        else 0
+        for value in value_column
+    ]
+
+    # Due dates compared against fixed bounds instead of per-row day arithmetic
+    window_start, window_end = (today + timedelta(days=days) for days in DUE_WINDOW_DAYS)
+    near_start, near_end = (today + timedelta(days=days) for days in DUE_NEAR_WINDOW_DAYS)
+    due_points = [
+        0 if due_date is None
+        else DUE_WINDOW_POINTS if window_start <= due_date <= window_end
+        else DUE_NEAR_WINDOW_POINTS if near_start <= due_date <= near_end
+        else 0
+        for due_date in due_date_column
+    ]
+
+    return [
+        min(sum(points), 100)
+        for points in zip(naics_points, jurisdiction_points, value_points, due_points)
+    ]
 
 class OpportunityService:
     """Service for opportunity operations"""
@@ -56,13 +124,30 @@ class OpportunityService:
             joinedload(Opportunity.jurisdiction)
         )
         
+        # Join jurisdictions for the jurisdiction code filter
+        if filters.jurisdiction_codes:
+            query = query.join(Jurisdiction)
+
+        query = self._apply_search_filters(query, filters)
+        
+        # Order by relevance score and due date
+        query = query.order_by(
+            Opportunity.relevance_score.desc().nullslast(),
+            Opportunity.due_date.asc()
+        )
+        
+        return query.all()
+    
+    @staticmethod
+    def _apply_search_filters(query, filters: OpportunitySearchFilters):
+        """Apply search filters; the jurisdiction code filter needs Jurisdiction joined"""
         # Filter by active status
         if filters.is_active is not None:
             query = query.filter(Opportunity.is_active == filters.is_active)
         
         # Filter by jurisdiction codes
         if filters.jurisdiction_codes:
-            query = query.join(Jurisdiction).filter(
+            query = query.filter(
                 Jurisdiction.code.in_(filters.jurisdiction_codes)
             )
         
@@ -89,13 +174,85 @@ class OpportunityService:
                 )
             )
         
-        # Order by relevance score and due date
-        query = query.order_by(
-            Opportunity.relevance_score.desc().nullslast(),
-            Opportunity.due_date.asc()
+        return query
+    
+    def scored_search_opportunities(
+        self,
+        search: OpportunityScoredSearch
+    ) -> List[Opportunity]:
+        """
+        Search opportunities ranked by relevance to an organization, in SQL
+
+        The calculate_relevance_score rubric is a CASE expression per
+        component, so filtering on min_relevance, ORDER BY score and
+        OFFSET/LIMIT all run in Postgres and only the requested page is
+        transferred. Ties go to the most recently posted. relevance_score
+        is set on the returned objects (not persisted).
+        """
+        today = date.today()
+        score = self.relevance_score_expression(
+            search.organization_naics,
+            search.organization_jurisdictions,
+            today
+        ).label("score")
+
+        query = self.db.query(Opportunity, score).outerjoin(
+            Jurisdiction, Jurisdiction.id == Opportunity.jurisdiction_id
+        ).options(contains_eager(Opportunity.jurisdiction))
+        query = self._apply_search_filters(query, search)
+
+        if search.min_relevance:
+            query = query.filter(score >= search.min_relevance)
+
+        rows = query.order_by(
+            score.desc(),
+            Opportunity.posted_date.desc().nullslast(),
+            Opportunity.id.desc()
+        ).offset(search.skip).limit(search.limit).all()
+
+        opportunities = []
+        for opportunity, opportunity_score in rows:
+            opportunity.relevance_score = opportunity_score
+            opportunities.append(opportunity)
+        return opportunities
+
+    @staticmethod
+    def relevance_score_expression(
+        organization_naics: List[str],
+        organization_jurisdictions: List[str],
+        today: Optional[date] = None
+    ):
+        """
+        The relevance rubric as a SQL expression (same points as score_relevance)
+
+        Needs Jurisdiction joined to Opportunity.
+        """
+        today = today or date.today()
+        window_start, window_end = (today + timedelta(days=days) for days in DUE_WINDOW_DAYS)
+        near_start, near_end = (today + timedelta(days=days) for days in DUE_NEAR_WINDOW_DAYS)
+
+        naics_points = case(
+            (Opportunity.naics_codes.overlap(list(organization_naics)), NAICS_MATCH_POINTS),
+            else_=0
         )
-        
-        return query.all()
+        jurisdiction_points = case(
+            (Jurisdiction.code.in_(list(organization_jurisdictions)), JURISDICTION_MATCH_POINTS),
+            else_=0
+        )
+        # A zero value scores nothing, as in score_relevance
+        value_points = case(
+            (Opportunity.total_value.between(*VALUE_BAND), VALUE_BAND_POINTS),
+            (and_(Opportunity.total_value < VALUE_BAND[0], Opportunity.total_value != 0), VALUE_BELOW_BAND_POINTS),
+            else_=0
+        )
+        # First matching branch wins, so the near window excludes the window itself
+        due_points = case(
+            (Opportunity.due_date.between(window_start, window_end), DUE_WINDOW_POINTS),
+            (Opportunity.due_date.between(near_start, near_end), DUE_NEAR_WINDOW_POINTS),
+            else_=0
+        )
+
+        return naics_points + jurisdiction_points + value_points + due_points
     
     def get_opportunities_by_jurisdiction(
         self, 
@@ -149,34 +306,81 @@ class OpportunityService:
         Calculate relevance score for an opportunity (0-100)
         Based on NAICS match, jurisdiction match, and other factors
         """
-        score = 0
-        
-        # NAICS code match (40 points)
-        if opportunity.naics_codes:
-            matching_naics = set(opportunity.naics_codes) & set(organization_naics)
-            if matching_naics:
-                score += 40
-        
-        # Jurisdiction match (30 points)
         jurisdiction = self.db.query(Jurisdiction).filter(
             Jurisdiction.id == opportunity.jurisdiction_id
         ).first()
-        if jurisdiction and jurisdiction.code in organization_jurisdictions:
-            score += 30
-        
-        # Value range (15 points) - prefer opportunities in sweet spot
-        if opportunity.total_value:
-            if 100000 <= opportunity.total_value <= 5000000:
-                score += 15
-            elif opportunity.total_value < 100000:
-                score += 5
-        
-        # Time until due (15 points) - prefer opportunities with reasonable time
-        if opportunity.due_date:
-            days_until_due = (opportunity.due_date - date.today()).days
-            if 14 <= days_until_due <= 60:
-                score += 15
-            elif 7 <= days_until_due < 14 or 60 < days_until_due <= 90:
-                score += 8
-        
-        return min(score, 100)
\ No newline at end of file
+
+        return score_relevance(
+            [opportunity.naics_codes],
+            [jurisdiction.code if jurisdiction else None],
+            [opportunity.total_value],
+            [opportunity.due_date],
+            organization_naics,
+            organization_jurisdictions
+        )[0]
+
+    def get_relevant_opportunities(
+        self,
+        organization_naics: List[str],
+        organization_jurisdictions: List[str],
+        min_relevance: int = 50,
+        limit: int = 100
+    ) -> List[Opportunity]:
+        """
+        Top `limit` active opportunities by relevance score (at least min_relevance)
+
+        Scores every active opportunity from one narrow query (id, NAICS codes,
+        jurisdiction code, value, dates) with the columnar score_relevance,
+        then loads only the top-k opportunities with their jurisdictions.
+        Ties go to the most recently posted. relevance_score is set on the
+        returned objects (not persisted).
+        """
+        rows = self.db.query(
+            Opportunity.id,
+            Opportunity.naics_codes,
+            Jurisdiction.code,
+            Opportunity.total_value,
+            Opportunity.due_date,
+            Opportunity.posted_date
+        ).outerjoin(
+            Jurisdiction, Jurisdiction.id == Opportunity.jurisdiction_id
+        ).filter(Opportunity.is_active == True).all()
+
+        if not rows:
+            return []
+
+        ids, naics_codes, jurisdiction_codes, values, due_dates, posted_dates = zip(*rows)
+        scores = score_relevance(
+            naics_codes,
+            jurisdiction_codes,
+            values,
+            due_dates,
+            organization_naics,
+            organization_jurisdictions
+        )
+
+        top = heapq.nlargest(
+            limit,
+            (
+                (score, posted_date or date.min, opportunity_id)
+                for score, posted_date, opportunity_id in zip(scores, posted_dates, ids)
+                if score >= min_relevance
+            ),
+            key=lambda candidate: candidate[:2]
+        )
+        if not top:
+            return []
+
+        opportunities = {
+            opportunity.id: opportunity
+            for opportunity in self.db.query(Opportunity).options(
+                joinedload(Opportunity.jurisdiction)
+            ).filter(Opportunity.id.in_([opportunity_id for _, _, opportunity_id in top]))
+        }
+
+        ranked = []
+        for score, _, opportunity_id in top:
+            opportunity = opportunities[opportunity_id]
+            opportunity.relevance_score = score
+            ranked.append(opportunity)
+        return ranked
\ No newline at end of file
@@ -1,17 +1,93 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
 from decimal import Decimal
+import threading
+import time
 from app.models import (
     PreBidAssessment,
     Opportunity,
     Jurisdiction,
-    SubcontractorDirectory,
-    Subcontractor,
-    Certification
+    SubcontractorDirectory
 )
-from app.schemas.pre_bid_assessment import PreBidAssessmentCreate, AssessmentRequest
-from app.services.subcontractor_directory_service import SubcontractorDirectoryService
+from app.schemas.pre_bid_assessment import (
+    PreBidAssessmentCreate,
+    AssessmentRequest,
+    BatchAssessmentRequest
+)
+from app.services.subcontractor_directory_service import (
+    SubcontractorDirectoryService,
+    DirectoryCandidate,
+    directory_match_index
+)
+from app.services.subcontractor_service import NetworkCapacity, network_capacity_index
+
+class AssessmentResultCache:
+    """
+    Process-wide cache of time-independent assessment evaluations
+
+    Keyed by (organization, opportunity) and stored with the versions they
+    were computed from: the organization's NetworkCapacity generation, the
+    directory version (bumped by every directory write) and the opportunity
+    fields the evaluation reads. An entry is only used while all three match;
+    the due date factor and recommendation are always recomputed. Entries
+    also expire after max_age_seconds so other worker processes' directory
+    writes are picked up.
+    """
+
+    def __init__(self, max_age_seconds: float = 300, max_entries: int = 10000):
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[UUID, UUID], Tuple[float, Tuple, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, organization_id: UUID, opportunity_id: UUID, versions: Tuple) -> Optional[Dict]:
+        """Cached evaluation computed from the same versions, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get((organization_id, opportunity_id))
+            if (
+                entry
+                and entry[1] == versions
+                and time.monotonic() - entry[0] < self.max_age_seconds
+            ):
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+
+    def put(self, organization_id: UUID, opportunity_id: UUID, versions: Tuple, base_data: Dict) -> None:
+        """Store an evaluation, dropping the oldest entry when full"""
+        with self._lock:
+            key = (organization_id, opportunity_id)
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic(), versions, base_data)
+
+    def invalidate(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "max_entries": self.max_entries,
+                "max_age_seconds": self.max_age_seconds
+            }
+
+
+# Shared by every PreBidAssessmentService
+assessment_result_cache = AssessmentResultCache()
 
 class PreBidAssessmentService:
     """Service for pre-bid assessment operations"""
@@ -19,6 +95,8 @@ class PreBidAssessmentService:
     def __init__(self, db: Session):
         self.db = db
         self.subcontractor_service = SubcontractorDirectoryService(db)
+        self.network_index = network_capacity_index
+        self.result_cache = assessment_result_cache
     
     def create_assessment(
         self, 
@@ -51,67 +129,6 @@ class PreBidAssessmentService:
             PreBidAssessment.organization_id == organization_id
         ).order_by(PreBidAssessment.assessed_at.desc()).all()
 
-    def _get_organization_network(self, organization_id: UUID) -> List[Subcontractor]:
-        """
-        Get organization's own network of subcontractors
-        These are the subcontractors that the organization has already worked with
-        or added to their network for bidding purposes.
-        """
-        return self.db.query(Subcontractor).options(
-            joinedload(Subcontractor.certifications)
-        ).filter(
-            Subcontractor.organization_id == organization_id
-        ).all()
-
-    def _calculate_network_capacity(
-        self,
-        network_subs: List[Subcontractor],
-        cert_type: str,
-        naics_codes: List[str] = None
-    ) -> Dict:
-        """
-        Calculate the capacity of organization's network for a specific certification type
-
-        Args:
-            network_subs: List of subcontractors in the organization's network
-            cert_type: Type of certification to check (e.g., 'MBE', 'VSBE')
-            naics_codes: Optional NAICS codes to filter by capability
-
-        Returns:
-            Dict with count and list of matching subcontractors
-        """
-        matching_subs = []
-
-        for sub in network_subs:
-            # Check if subcontractor has the required certification type
-            has_cert = False
-
-            # Check certifications relationship
-            for cert in sub.certifications:
-                if cert.cert_type and cert_type.upper() in cert.cert_type.upper():
-                    # If NAICS codes are specified, check if they match
-                    if naics_codes and cert.naics_codes:
-                        # cert.naics_codes is stored as JSONB, could be a list
-                        cert_naics_list = cert.naics_codes if isinstance(cert.naics_codes, list) else []
-                        if any(naics in cert_naics_list for naics in naics_codes):
-                            has_cert = True
-                            break
-                    else:
-                        has_cert = True
-                        break
-
-            # Fallback: check is_mbe flag for MBE certification
-            if cert_type.upper() == 'MBE' and sub.is_mbe:
-                has_cert = True
-
-            if has_cert:
-                matching_subs.append(sub)
-
-        return {
-            "count": len(matching_subs),
-            "subcontractors": matching_subs
-        }
-    
     def perform_assessment(
         self, 
         request: AssessmentRequest
@@ -134,10 +151,271 @@ class PreBidAssessmentService:
         if not jurisdiction:
             raise ValueError(f"Opportunity {request.opportunity_id} has no associated jurisdiction")
 
+        # 1. Get organization's own network first
+        org_network = self.network_index.get(self.db, request.organization_id)
+
+        # Read before evaluating, so a write during evaluation outdates the cached result
+        versions = (
+            org_network.generation,
+            directory_match_index.version,
+            self._opportunity_inputs(opportunity)
+        )
+        base_data = None
+        if request.use_cache:
+            base_data = self.result_cache.get(request.organization_id, opportunity.id, versions)
+
+        if base_data is None:
+            # 2. Find additional available subcontractors from directory, MBE and VSBE in one scan
+            certifications = self._directory_certifications(opportunity)
+            candidates = []
+            if certifications:
+                candidates = self.subcontractor_service.get_matching_candidates(
+                    naics_codes=opportunity.naics_codes,
+                    jurisdiction_code=jurisdiction.code,
+                    certifications=certifications,
+                    min_rating=2.0
+                )
+            matching_subs_mbe, matching_subs_vsbe = self._split_candidates(candidates, certifications)
+
+            base_data = self._evaluate_assessment(
+                request.organization_id,
+                opportunity,
+                org_network,
+                matching_subs_mbe,
+                matching_subs_vsbe
+            )
+            if request.use_cache:
+                self.result_cache.put(request.organization_id, opportunity.id, versions, base_data)
+
+        assessment_data = self._apply_timeline(base_data, opportunity)
+
+        if request.skip_unchanged:
+            latest = self._latest_assessment(request.organization_id, opportunity.id)
+            if latest and self._same_outcome(latest, assessment_data):
+                return self._assessment_response(latest, assessment_data, opportunity)
+
+        # 8. Save the assessment
+        assessment = self._assessment_row(assessment_data)
+        
+        self.db.add(assessment)
+        self.db.commit()
+        self.db.refresh(assessment)
+        
+        return self._assessment_response(assessment, assessment_data, opportunity)
+
+    @staticmethod
+    def _opportunity_inputs(opportunity: Opportunity) -> Tuple:
+        """Opportunity fields the cached (time-independent) evaluation depends on"""
+        return (
+            tuple(opportunity.naics_codes or ()),
+            opportunity.mbe_goal,
+            opportunity.vsbe_goal,
+            opportunity.total_value,
+            opportunity.jurisdiction.code
+        )
+
+    def _latest_assessment(
+        self,
+        organization_id: UUID,
+        opportunity_id: UUID
+    ) -> Optional[PreBidAssessment]:
+        """Most recently saved assessment of an opportunity for an organization"""
+        return self.db.query(PreBidAssessment).filter(
+            PreBidAssessment.organization_id == organization_id,
+            PreBidAssessment.opportunity_id == opportunity_id
+        ).order_by(PreBidAssessment.assessed_at.desc()).first()
+
+    @staticmethod
+    def _same_outcome(assessment: PreBidAssessment, assessment_data: Dict) -> bool:
+        """Whether a saved assessment stores exactly what assessment_data would"""
+        return (
+            assessment.overall_risk_score == assessment_data["overall_risk_score"]
+            and assessment.mbe_gap_percentage == assessment_data["mbe_gap_percentage"]
+            and assessment.vsbe_gap_percentage == assessment_data["vsbe_gap_percentage"]
+            and assessment.available_subcontractors_count == assessment_data["available_subcontractors_count"]
+            and assessment.recommendation == assessment_data["recommendation"]
+            and assessment.recommendation_reason == assessment_data["recommendation_reason"]
+        )
+
+    def perform_batch_assessment(
+        self,
+        request: BatchAssessmentRequest
+    ) -> Dict:
+        """
+        Assess many opportunities for one organization in one pass
+
+        Opportunities come from request.opportunity_ids and/or
+        request.filters (the opportunity search filters). The organization
+        network is loaded once, directory candidates for all opportunities
+        are fetched in one query and matched per opportunity in memory, and
+        all PreBidAssessment rows are inserted in one flush. Each assessment
+        is the same as POST /assessments/perform would produce; opportunities
+        that are not found or have no jurisdiction are reported in "skipped".
+        """
+        from app.services.opportunity_service import OpportunityService
+
+        if request.opportunity_ids is None and request.filters is None:
+            raise ValueError("Provide opportunity_ids or filters")
+
+        query = self.db.query(Opportunity).options(joinedload(Opportunity.jurisdiction))
+        if request.opportunity_ids is not None:
+            query = query.filter(Opportunity.id.in_(request.opportunity_ids))
+        if request.filters is not None:
+            if request.filters.jurisdiction_codes:
+                query = query.join(Jurisdiction)
+            query = OpportunityService._apply_search_filters(query, request.filters)
+        query = query.order_by(Opportunity.due_date.asc().nullslast(), Opportunity.id)
+        if request.opportunity_ids is None:
+            query = query.limit(request.limit)
+        opportunities = query.all()
+
+        skipped = []
+        if request.opportunity_ids is not None:
+            found = {opportunity.id for opportunity in opportunities}
+            missing_reason = (
+                "Opportunity not found or excluded by filters"
+                if request.filters is not None
+                else "Opportunity not found"
+            )
+            skipped += [
+                {"opportunity_id": str(opportunity_id), "reason": missing_reason}
+                for opportunity_id in dict.fromkeys(request.opportunity_ids)
+                if opportunity_id not in found
+            ]
+            # Existing opportunities past the limit are reported, not dropped
+            skipped += [
+                {"opportunity_id": str(opportunity.id), "reason": "Batch limit exceeded"}
+                for opportunity in opportunities[request.limit:]
+            ]
+            opportunities = opportunities[:request.limit]
+        skipped += [
+            {"opportunity_id": str(opportunity.id), "reason": "Opportunity has no associated jurisdiction"}
+            for opportunity in opportunities
+            if not opportunity.jurisdiction
+        ]
+        opportunities = [opportunity for opportunity in opportunities if opportunity.jurisdiction]
+
+        org_network = self.network_index.get(self.db, request.organization_id)
+        candidates = self._load_directory_candidates(opportunities, min_rating=2.0)
+
+        evaluated = []
+        for opportunity in opportunities:
+            certifications = self._directory_certifications(opportunity)
+            matching_subs_mbe, matching_subs_vsbe = self._split_candidates(
+                self._match_candidates(candidates, opportunity),
+                certifications
+            )
+
+            assessment_data = self._apply_timeline(
+                self._evaluate_assessment(
+                    request.organization_id,
+                    opportunity,
+                    org_network,
+                    matching_subs_mbe,
+                    matching_subs_vsbe
+                ),
+                opportunity
+            )
+            evaluated.append((opportunity, assessment_data, self._assessment_row(assessment_data)))
+
+        # One flush inserts every row; ids and timestamps are set client-side
+        self.db.add_all([assessment for _, _, assessment in evaluated])
+        self.db.flush()
+        results = [
+            self._assessment_response(assessment, assessment_data, opportunity)
+            for opportunity, assessment_data, assessment in evaluated
+        ]
+        self.db.commit()
+
+        return {
+            "organization_id": str(request.organization_id),
+            "assessed_count": len(results),
+            "assessments": results,
+            "skipped": skipped
+        }
+
+    def _load_directory_candidates(
+        self,
+        opportunities: List[Opportunity],
+        min_rating: float
+    ) -> List[DirectoryCandidate]:
+        """
+        Directory candidates that could match any of the opportunities, best rated first
+
+        One query over the union of the opportunities' NAICS and jurisdiction
+        codes, for the certification categories any of them needs.
+        """
+        naics_codes = sorted({
+            code
+            for opportunity in opportunities
+            for code in opportunity.naics_codes or []
+        })
+        jurisdiction_codes = sorted({opportunity.jurisdiction.code for opportunity in opportunities})
+        certifications = sorted({
+            category
+            for opportunity in opportunities
+            for category in self._directory_certifications(opportunity)
+        })
+        if not naics_codes or not jurisdiction_codes or not certifications:
+            return []
+
+        query = self.subcontractor_service.candidate_query(certifications, min_rating).filter(
+            SubcontractorDirectory.naics_codes.overlap(naics_codes),
+            SubcontractorDirectory.jurisdiction_codes.overlap(jurisdiction_codes)
+        )
+        return [DirectoryCandidate(*row) for row in query.all()]
+
+    @staticmethod
+    def _match_candidates(
+        candidates: List[DirectoryCandidate],
+        opportunity: Opportunity
+    ) -> List[DirectoryCandidate]:
+        """Candidates matching one opportunity, as get_matching_candidates would return them"""
+        naics_codes = set(opportunity.naics_codes or [])
+        jurisdiction_code = opportunity.jurisdiction.code
+        return [
+            candidate for candidate in candidates
+            if not naics_codes.isdisjoint(candidate.naics_codes or [])
+            and jurisdiction_code in (candidate.jurisdiction_codes or [])
+        ]
+
+    @staticmethod
+    def _directory_certifications(opportunity: Opportunity) -> List[str]:
+        """Certification categories to match in the directory (those with a goal, given NAICS codes)"""
+        if not opportunity.naics_codes:
+            return []
+        return [
+            category
+            for category, goal in (('mbe', opportunity.mbe_goal), ('vsbe', opportunity.vsbe_goal))
+            if goal and goal > 0
+        ]
+
+    @staticmethod
+    def _split_candidates(
+        candidates: List[DirectoryCandidate],
+        certifications: List[str]
+    ) -> Tuple[List[DirectoryCandidate], List[DirectoryCandidate]]:
+        """MBE and VSBE matches among candidates, for the categories that were matched"""
+        matching_subs_mbe = [c for c in candidates if c.is_mbe] if 'mbe' in certifications else []
+        matching_subs_vsbe = [c for c in candidates if c.is_vsbe] if 'vsbe' in certifications else []
+        return matching_subs_mbe, matching_subs_vsbe
+
+    def _evaluate_assessment(
+        self,
+        organization_id: UUID,
+        opportunity: Opportunity,
+        org_network: NetworkCapacity,
+        matching_subs_mbe: List[DirectoryCandidate],
+        matching_subs_vsbe: List[DirectoryCandidate]
+    ) -> Dict:
+        """
+        Gaps, network and directory counts and risk factors for one opportunity,
+        without the due date factor (see _apply_timeline)
+        """
         # Initialize assessment data
         assessment_data = {
-            "organization_id": request.organization_id,
-            "opportunity_id": request.opportunity_id,
+            "organization_id": organization_id,
+            "opportunity_id": opportunity.id,
             "overall_risk_score": 0,
             "mbe_gap_percentage": Decimal('0.0'),
             "vsbe_gap_percentage": Decimal('0.0'),
@@ -154,47 +432,15 @@ class PreBidAssessmentService:
         risk_score = 0
         risk_factors = []
 
-        # 1. Get organization's own network first
-        org_network = self._get_organization_network(request.organization_id)
-        assessment_data["organization_network_count"] = len(org_network)
-
-        # Calculate organization's network capacity for MBE and VSBE
-        org_network_mbe = self._calculate_network_capacity(
-            org_network,
-            cert_type='MBE',
-            naics_codes=opportunity.naics_codes if opportunity.naics_codes else None
-        )
-        org_network_vsbe = self._calculate_network_capacity(
-            org_network,
-            cert_type='VSBE',
-            naics_codes=opportunity.naics_codes if opportunity.naics_codes else None
-        )
+        # 1. Organization's own network first
+        assessment_data["organization_network_count"] = org_network.total_count
 
-        assessment_data["organization_network_mbe_count"] = org_network_mbe["count"]
-        assessment_data["organization_network_vsbe_count"] = org_network_vsbe["count"]
+        # Organization's network capacity for MBE and VSBE
+        org_network_mbe = org_network.count('MBE', opportunity.naics_codes)
+        org_network_vsbe = org_network.count('VSBE', opportunity.naics_codes)
 
-        # 2. Find additional available subcontractors from directory
-        matching_subs_mbe = []
-        matching_subs_vsbe = []
-
-        if opportunity.naics_codes and jurisdiction:
-            # Find MBE subcontractors from directory
-            if opportunity.mbe_goal and opportunity.mbe_goal > 0:
-                matching_subs_mbe = self.subcontractor_service.get_matching_subcontractors(
-                    naics_codes=opportunity.naics_codes,
-                    jurisdiction_code=jurisdiction.code,
-                    is_mbe=True,
-                    min_rating=2.0
-                )
-
-            # Find VSBE subcontractors from directory
-            if opportunity.vsbe_goal and opportunity.vsbe_goal > 0:
-                matching_subs_vsbe = self.subcontractor_service.get_matching_subcontractors(
-                    naics_codes=opportunity.naics_codes,
-                    jurisdiction_code=jurisdiction.code,
-                    is_vsbe=True,
-                    min_rating=2.0
-                )
+        assessment_data["organization_network_mbe_count"] = org_network_mbe
+        assessment_data["organization_network_vsbe_count"] = org_network_vsbe
 
         # Total matching includes both org network and directory
         total_matching = len(set([s.id for s in matching_subs_mbe + matching_subs_vsbe]))
@@ -224,9 +470,9 @@ class PreBidAssessmentService:
         
         # 2. Calculate MBE gap (considering both org network and directory)
         if opportunity.mbe_goal and opportunity.mbe_goal > 0:
-            total_mbe_available = org_network_mbe["count"] + len(matching_subs_mbe)
+            total_mbe_available = org_network_mbe + len(matching_subs_mbe)
 
-            if org_network_mbe["count"] == 0 and len(matching_subs_mbe) == 0:
+            if org_network_mbe == 0 and len(matching_subs_mbe) == 0:
                 # No MBE subs at all - critical
                 assessment_data["mbe_gap_percentage"] = -opportunity.mbe_goal
                 risk_score += 40
@@ -234,11 +480,11 @@ class PreBidAssessmentService:
                     f"CRITICAL: No MBE subcontractors in your network or directory. "
                     f"Need {opportunity.mbe_goal}% participation."
                 )
-            elif org_network_mbe["count"] >= 3:
+            elif org_network_mbe >= 3:
                 # Organization has sufficient MBE network - excellent
                 assessment_data["mbe_gap_percentage"] = Decimal('0.0')
                 risk_factors.append(
-                    f"EXCELLENT: You have {org_network_mbe['count']} MBE subcontractors in your network "
+                    f"EXCELLENT: You have {org_network_mbe} MBE subcontractors in your network "
                     f"to meet {opportunity.mbe_goal}% goal."
                 )
             elif total_mbe_available < 3:
@@ -247,7 +493,7 @@ class PreBidAssessmentService:
                 risk_score += 25
                 risk_factors.append(
                     f"WARNING: Only {total_mbe_available} MBE subcontractors available "
-                    f"({org_network_mbe['count']} in your network, {len(matching_subs_mbe)} in directory). "
+                    f"({org_network_mbe} in your network, {len(matching_subs_mbe)} in directory). "
                     f"Limited options to meet {opportunity.mbe_goal}% goal."
                 )
             else:
@@ -255,15 +501,15 @@ class PreBidAssessmentService:
                 assessment_data["mbe_gap_percentage"] = Decimal('0.0')
                 risk_factors.append(
                     f"GOOD: {total_mbe_available} MBE subcontractors available "
-                    f"({org_network_mbe['count']} in your network, {len(matching_subs_mbe)} in directory) "
+                    f"({org_network_mbe} in your network, {len(matching_subs_mbe)} in directory) "
                     f"to meet {opportunity.mbe_goal}% goal."
                 )
 
         # 3. Calculate VSBE gap (considering both org network and directory)
         if opportunity.vsbe_goal and opportunity.vsbe_goal > 0:
-            total_vsbe_available = org_network_vsbe["count"] + len(matching_subs_vsbe)
+            total_vsbe_available = org_network_vsbe + len(matching_subs_vsbe)
 
-            if org_network_vsbe["count"] == 0 and len(matching_subs_vsbe) == 0:
+            if org_network_vsbe == 0 and len(matching_subs_vsbe) == 0:
                 # No VSBE subs at all
                 assessment_data["vsbe_gap_percentage"] = -opportunity.vsbe_goal
                 risk_score += 20
@@ -271,11 +517,11 @@ class PreBidAssessmentService:
                     f"WARNING: No VSBE subcontractors in your network or directory. "
                     f"Need {opportunity.vsbe_goal}% participation."
                 )
-            elif org_network_vsbe["count"] >= 2:
+            elif org_network_vsbe >= 2:
                 # Organization has sufficient VSBE network
                 assessment_data["vsbe_gap_percentage"] = Decimal('0.0')
                 risk_factors.append(
-                    f"GOOD: You have {org_network_vsbe['count']} VSBE subcontractors in your network."
+                    f"GOOD: You have {org_network_vsbe} VSBE subcontractors in your network."
                 )
             elif total_vsbe_available < 2:
                 # Limited options
@@ -283,7 +529,7 @@ class PreBidAssessmentService:
                 risk_score += 10
                 risk_factors.append(
                     f"CAUTION: Only {total_vsbe_available} VSBE subcontractors available "
-                    f"({org_network_vsbe['count']} in your network, {len(matching_subs_vsbe)} in directory)."
+                    f"({org_network_vsbe} in your network, {len(matching_subs_vsbe)} in directory)."
                 )
             else:
                 assessment_data["vsbe_gap_percentage"] = Decimal('0.0')
@@ -302,7 +548,23 @@ class PreBidAssessmentService:
                 risk_factors.append(
                     "INFO: Small contract value may have lower margins."
                 )
-        
+
+        assessment_data["risk_factors"] = risk_factors
+        assessment_data["base_risk_score"] = risk_score
+        return assessment_data
+
+    @staticmethod
+    def _apply_timeline(base_data: Dict, opportunity: Opportunity) -> Dict:
+        """
+        Complete an evaluation with its time-dependent part: the due date
+        risk factor, overall risk score and recommendation
+
+        base_data is left unchanged, so a cached evaluation can be reused.
+        """
+        assessment_data = dict(base_data, risk_factors=list(base_data["risk_factors"]))
+        risk_score = assessment_data.pop("base_risk_score")
+        risk_factors = assessment_data["risk_factors"]
+
         # 5. Check due date
         if opportunity.due_date:
             from datetime import date, timedelta
@@ -347,8 +609,12 @@ class PreBidAssessmentService:
                 "Strong opportunity to pursue."
             )
         
-        # 8. Save the assessment
-        assessment = PreBidAssessment(
+        return assessment_data
+
+    @staticmethod
+    def _assessment_row(assessment_data: Dict) -> PreBidAssessment:
+        """PreBidAssessment row for evaluated assessment data"""
+        return PreBidAssessment(
             organization_id=assessment_data["organization_id"],
             opportunity_id=assessment_data["opportunity_id"],
             overall_risk_score=assessment_data["overall_risk_score"],
@@ -358,12 +624,14 @@ class PreBidAssessmentService:
             recommendation=assessment_data["recommendation"],
             recommendation_reason=assessment_data["recommendation_reason"]
         )
-        
-        self.db.add(assessment)
-        self.db.commit()
-        self.db.refresh(assessment)
-        
-        # Return full assessment data including transient fields
+
+    @staticmethod
+    def _assessment_response(
+        assessment: PreBidAssessment,
+        assessment_data: Dict,
+        opportunity: Opportunity
+    ) -> Dict:
+        """JSON-serializable assessment result, including transient fields"""
         # Manually construct opportunity dict to avoid serialization issues
         opportunity_dict = {
             "id": str(opportunity.id),
@@ -407,22 +675,61 @@ class PreBidAssessmentService:
     
     def get_assessment_summary_by_organization(
         self, 
-        organization_id: UUID
+        organization_id: UUID,
+        include_monthly: bool = False
     ) -> Dict:
-        """Get summary statistics of assessments for an organization"""
-        assessments = self.get_assessments_by_organization(organization_id)
-        
-        total = len(assessments)
-        bid_count = sum(1 for a in assessments if a.recommendation == "BID")
-        caution_count = sum(1 for a in assessments if a.recommendation == "CAUTION")
-        no_bid_count = sum(1 for a in assessments if a.recommendation == "NO_BID")
-        
-        avg_risk_score = sum(a.overall_risk_score or 0 for a in assessments) / total if total > 0 else 0
-        
+        """
+        Get summary statistics of assessments for an organization
+
+        Counted in one aggregate query (COUNT ... FILTER per recommendation)
+        without loading assessment rows. With include_monthly, adds a
+        "monthly" series of the same figures per month of assessed_at.
+        """
+        row = self.db.query(*self._recommendation_counts()).filter(
+            PreBidAssessment.organization_id == organization_id
+        ).one()
+
+        summary = self._summary(row)
+
+        if include_monthly:
+            month = func.date_trunc('month', PreBidAssessment.assessed_at).label("month")
+            rows = self.db.query(month, *self._recommendation_counts()).filter(
+                PreBidAssessment.organization_id == organization_id,
+                PreBidAssessment.assessed_at.isnot(None)
+            ).group_by(month).order_by(month).all()
+
+            summary["monthly"] = [
+                {"month_start": row.month.date(), **self._summary(row)}
+                for row in rows
+            ]
+
+        return summary
+
+    @staticmethod
+    def _recommendation_counts() -> list:
+        """Total, per-recommendation COUNT(*) FILTER and risk score sum columns"""
+        return [func.count().label("total")] + [
+            func.count().filter(PreBidAssessment.recommendation == recommendation).label(recommendation.lower())
+            for recommendation in ('BID', 'CAUTION', 'NO_BID')
+        ] + [
+            # Unscored assessments count as 0, as in the average below
+            func.coalesce(func.sum(PreBidAssessment.overall_risk_score), 0).label("risk_score_sum")
+        ]
+
+    @staticmethod
+    def _summary(row) -> Dict:
+        """Summary figures from a _recommendation_counts row"""
+        total = row.total
+        avg_risk_score = row.risk_score_sum / total if total > 0 else 0
+
         return {
             "total_assessments": total,
-            "bid_recommended": bid_count,
-            "caution_recommended": caution_count,
-            "no_bid_recommended": no_bid_count,
+            "bid_recommended": row.bid,
+            "caution_recommended": row.caution,
+            "no_bid_recommended": row.no_bid,
             "average_risk_score": round(avg_risk_score, 2)
-        }
\ No newline at end of file
+        }
+
+    def get_result_cache_stats(self) -> Dict:
+        """Hit/miss counters of the shared assessment result cache"""
+        return self.result_cache.stats()
@@ -1,19 +1,260 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func, Boolean
+from decimal import Decimal
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import or_, and_, func, literal, tuple_, cast, select, update
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+import base64
+import binascii
+import json
+import threading
+import time
+from app.config import settings
+from app.database import Explain
 from app.models import SubcontractorDirectory
 from app.schemas.subcontractor_directory import (
+    SubcontractorDirectory as SubcontractorDirectorySchema,
     SubcontractorDirectoryCreate, 
     SubcontractorDirectoryUpdate,
     SubcontractorSearchFilters
 )
 
+# Page size cap for directory search
+MAX_PAGE_SIZE = 200
+
+class DirectoryCandidate(NamedTuple):
+    """Directory entry columns shown in matching results, with its MBE/VSBE flags"""
+    id: UUID
+    legal_name: str
+    federal_id: Optional[str]
+    certifications: Optional[Dict]
+    jurisdiction_codes: Optional[List[str]]
+    naics_codes: Optional[List[str]]
+    capabilities: Optional[str]
+    contact_email: Optional[str]
+    phone: Optional[str]
+    location_city: Optional[str]
+    rating: Optional[Decimal]
+    projects_completed: Optional[int]
+    is_verified: Optional[bool]
+    created_at: Optional[object]
+    is_mbe: bool
+    is_vsbe: bool
+
+class DirectoryMatchIndex:
+    """
+    In-process bitmap index over the directory for get_matching_subcontractors
+
+    Every directory entry gets a slot; each NAICS code, jurisdiction code,
+    certification flag and half-point rating bucket has a Python int bitmap
+    with the slots of the entries that have it. A match is an OR over the
+    requested NAICS codes, a few ANDs and a sort of the (small) result, with
+    entries returned as detached schema snapshots, so no DB round trip.
+
+    The index is loaded on first use and kept current by the directory
+    writes in SubcontractorDirectoryService and the outreach usage counts;
+    bulk writes invalidate it. It is rebuilt after max_age_seconds so other
+    worker processes pick up changes. Loads that started before a write are
+    not installed.
+    """
+
+    def __init__(self, max_age_seconds: float = 300):
+        self.max_age_seconds = max_age_seconds
+        self.version = 0
+        self.loads = 0
+        self.matches = 0
+        self._loaded_at: Optional[float] = None
+        self._entries: List[Optional[SubcontractorDirectorySchema]] = []
+        self._slots: Dict[UUID, int] = {}
+        self._naics: Dict[str, int] = {}
+        self._jurisdictions: Dict[str, int] = {}
+        self._certified: Dict[str, int] = {}
+        self._rating_buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _rating_bucket(rating) -> int:
+        """Half-point bucket of a rating: 0 for [0, 0.5), 1 for [0.5, 1), ..."""
+        return int(Decimal(str(rating)) * 2)
+
+    def _bitmaps(self, entry: SubcontractorDirectorySchema) -> List[Tuple[Dict, object]]:
+        """(bitmap family, key) pairs an entry sets a bit in"""
+        pairs = [(self._naics, code) for code in set(entry.naics_codes or [])]
+        pairs += [(self._jurisdictions, code) for code in set(entry.jurisdiction_codes or [])]
+        # Same semantics as certifications @> '{"<category>": true}'
+        pairs += [
+            (self._certified, category)
+            for category, value in (entry.certifications or {}).items()
+            if value is True
+        ]
+        if entry.rating is not None:
+            pairs.append((self._rating_buckets, self._rating_bucket(entry.rating)))
+        return pairs
+
+    def _set(self, slot: int, entry: SubcontractorDirectorySchema) -> None:
+        bit = 1 << slot
+        for family, key in self._bitmaps(entry):
+            family[key] = family.get(key, 0) | bit
+
+    def _clear(self, slot: int) -> None:
+        entry = self._entries[slot]
+        if entry is None:
+            return
+        bit = ~(1 << slot)
+        for family, key in self._bitmaps(entry):
+            family[key] &= bit
+        self._entries[slot] = None
+
+    def _is_current(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.max_age_seconds
+        )
+
+    def _load(self, db: Session) -> bool:
+        """Rebuild every bitmap from the directory table; False if a write raced the load"""
+        with self._lock:
+            version = self.version
+        snapshots = [
+            SubcontractorDirectorySchema.model_validate(entry)
+            for entry in db.query(SubcontractorDirectory).all()
+        ]
+        with self._lock:
+            if version != self.version:
+                # A write landed while loading; the next match reloads
+                return False
+            self._entries = []
+            self._slots = {}
+            self._naics = {}
+            self._jurisdictions = {}
+            self._certified = {}
+            self._rating_buckets = {}
+            for slot, snapshot in enumerate(snapshots):
+                self._entries.append(snapshot)
+                self._slots[snapshot.id] = slot
+                self._set(slot, snapshot)
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+            return True
+
+    def match(
+        self,
+        db: Session,
+        naics_codes: List[str],
+        jurisdiction_code: str,
+        certifications: Iterable[str] = (),
+        min_rating: float = 0.0
+    ) -> Optional[List[SubcontractorDirectorySchema]]:
+        """
+        Entries with any of naics_codes (no NAICS filter if empty), listing
+        jurisdiction_code, certified in every given category and rated at
+        least min_rating, best rated first
+
+        Returns None when the index could not be loaded (callers query the DB).
+        """
+        if not self._is_current():
+            self._load(db)
+
+        with self._lock:
+            if self._loaded_at is None:
+                return None
+            self.matches += 1
+            mask = self._jurisdictions.get(jurisdiction_code, 0)
+            if naics_codes:
+                naics_mask = 0
+                for code in naics_codes:
+                    naics_mask |= self._naics.get(code, 0)
+                mask &= naics_mask
+            for category in certifications:
+                mask &= self._certified.get(category, 0)
+
+            # Whole buckets above the minimum pass; the minimum's own bucket is checked exactly
+            min_bucket = self._rating_bucket(min_rating)
+            rating_mask = 0
+            for bucket, bits in self._rating_buckets.items():
+                if bucket >= min_bucket:
+                    rating_mask |= bits
+            mask &= rating_mask
+
+            minimum = Decimal(str(min_rating))
+            matches = []
+            while mask:
+                low = mask & -mask
+                entry = self._entries[low.bit_length() - 1]
+                mask ^= low
+                if entry.rating >= minimum:
+                    matches.append(entry)
+
+        matches.sort(key=lambda entry: entry.rating, reverse=True)
+        return matches
+
+    def upsert(self, entry: SubcontractorDirectory) -> None:
+        """Add or refresh one committed directory entry"""
+        snapshot = SubcontractorDirectorySchema.model_validate(entry)
+        with self._lock:
+            self.version += 1
+            if self._loaded_at is None:
+                return
+            slot = self._slots.get(snapshot.id)
+            if slot is None:
+                slot = len(self._entries)
+                self._entries.append(None)
+                self._slots[snapshot.id] = slot
+            else:
+                self._clear(slot)
+            self._entries[slot] = snapshot
+            self._set(slot, snapshot)
+
+    def set_usage_counts(self, usage_counts: Dict[UUID, int]) -> None:
+        """Refresh contractors_using_count of indexed entries (no bitmap depends on it)"""
+        if not usage_counts:
+            return
+        with self._lock:
+            for entry_id, count in usage_counts.items():
+                slot = self._slots.get(entry_id)
+                if slot is not None:
+                    self._entries[slot] = self._entries[slot].model_copy(
+                        update={"contractors_using_count": count}
+                    )
+
+    def remove(self, entry_id: UUID) -> None:
+        """Drop one deleted directory entry"""
+        with self._lock:
+            self.version += 1
+            slot = self._slots.pop(entry_id, None)
+            if slot is not None:
+                self._clear(slot)
+
+    def invalidate(self) -> None:
+        """Drop the whole index (after bulk writes); the next match reloads"""
+        with self._lock:
+            self.version += 1
+            self._loaded_at = None
+
+    def stats(self) -> Dict:
+        """Load/match counters and current size"""
+        with self._lock:
+            return {
+                "enabled": settings.DIRECTORY_MATCH_INDEX,
+                "loaded": self._loaded_at is not None,
+                "entries": len(self._slots),
+                "naics_codes": len(self._naics),
+                "jurisdiction_codes": len(self._jurisdictions),
+                "loads": self.loads,
+                "matches": self.matches,
+                "max_age_seconds": self.max_age_seconds
+            }
+
+
+# Shared by every SubcontractorDirectoryService in this process
+directory_match_index = DirectoryMatchIndex()
+
 class SubcontractorDirectoryService:
     """Service for subcontractor directory operations"""
     
     def __init__(self, db: Session):
         self.db = db
+        self.match_index = directory_match_index
     
     def create_subcontractor(
         self, 
@@ -24,6 +265,7 @@ class SubcontractorDirectoryService:
         self.db.add(subcontractor)
         self.db.commit()
         self.db.refresh(subcontractor)
+        self.match_index.upsert(subcontractor)
         return subcontractor
     
     def get_subcontractor(
@@ -38,12 +280,109 @@ class SubcontractorDirectoryService:
     def search_subcontractors(
         self, 
         filters: SubcontractorSearchFilters
-    ) -> List[SubcontractorDirectory]:
-        """Search subcontractors with various filters"""
+    ) -> Dict:
+        """
+        Search subcontractors with various filters, one page at a time
+
+        With filters.ranked the query is matched against the full-text
+        search_vector (legal name, capabilities, city) or fuzzily against the
+        legal name (pg_trgm), and results are ordered by relevance.
+
+        Keyset pagination: results are ordered by (relevance), rating,
+        projects_completed, id and the opaque next_cursor holds the sort key
+        of the last row, so each page is a bounded index range scan instead
+        of an OFFSET. filters.limit is capped at MAX_PAGE_SIZE. total_estimate is
+        the planner's row estimate for the whole search, not an exact count;
+        it costs an EXPLAIN round trip, so it is only given on the first page
+        (no cursor) and is None on later pages.
+        Raises ValueError for a malformed cursor.
+        """
+        limit = max(1, min(filters.limit, MAX_PAGE_SIZE))
+        query, relevance = self._search_query(filters)
+
+        # Sort key, all descending; NULL rating/projects sort as 0
+        sort_key = [
+            func.coalesce(SubcontractorDirectory.rating, 0),
+            func.coalesce(SubcontractorDirectory.projects_completed, 0),
+            SubcontractorDirectory.id
+        ]
+        if relevance is not None:
+            # As double precision so the value round-trips exactly through the cursor
+            sort_key.insert(0, cast(relevance, DOUBLE_PRECISION))
+
+        total_estimate = None if filters.cursor else self._estimate_rows(query)
+
+        if filters.cursor:
+            values = self._decode_cursor(filters.cursor, len(sort_key))
+            query = query.filter(tuple_(*sort_key) < tuple_(*values))
+
+        rows = query.add_columns(*sort_key).order_by(
+            *[column.desc() for column in sort_key]
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1][1:])
+
+        return {
+            "items": [row[0] for row in rows],
+            "next_cursor": next_cursor,
+            "total_estimate": total_estimate
+        }
+
+    @staticmethod
+    def _encode_cursor(values) -> str:
+        """Opaque cursor from the sort key of the last row on a page"""
+        payload = json.dumps([
+            str(value) if isinstance(value, (Decimal, UUID)) else value
+            for value in values
+        ])
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, size: int) -> list:
+        """Sort key values from a cursor (relevance, rating, projects_completed, id)"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            if not isinstance(values, list) or len(values) != size:
+                raise ValueError
+            *leading, rating, projects_completed, row_id = values
+            return [float(value) for value in leading] + [
+                Decimal(rating),
+                int(projects_completed),
+                UUID(row_id)
+            ]
+        except (ValueError, TypeError, ArithmeticError, binascii.Error):
+            raise ValueError("Invalid cursor")
+
+    def _estimate_rows(self, query) -> int:
+        """Planner row estimate for a query (cheap stand-in for COUNT(*))"""
+        plan = self.db.execute(Explain(query.statement)).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _search_query(self, filters: SubcontractorSearchFilters):
+        """Filtered directory query and, for ranked search, its relevance expression"""
         query = self.db.query(SubcontractorDirectory)
+        relevance = None
+        
+        # Ranked full-text + trigram search
+        if filters.query and filters.ranked:
+            ts_query = func.websearch_to_tsquery('english', filters.query)
+            query = query.filter(
+                or_(
+                    SubcontractorDirectory.search_vector.op('@@')(ts_query),
+                    # word_similarity operator, served by the legal_name trigram index
+                    literal(filters.query).op('<%')(SubcontractorDirectory.legal_name)
+                )
+            )
+            relevance = (
+                func.ts_rank_cd(SubcontractorDirectory.search_vector, ts_query)
+                + func.word_similarity(filters.query, SubcontractorDirectory.legal_name)
+            )
         
         # Text search on name
-        if filters.query:
+        elif filters.query:
             search_term = f"%{filters.query}%"
             query = query.filter(
                 SubcontractorDirectory.legal_name.ilike(search_term)
@@ -64,29 +403,20 @@ class SubcontractorDirectoryService:
         # Filter by MBE certification
         if filters.is_mbe is not None:
             if filters.is_mbe:
-                query = query.filter(
-                    SubcontractorDirectory.certifications['mbe'].astext.cast(
-                        type_=type(True)
-                    ) == True
-                )
+                query = query.filter(self._certified('mbe'))
             else:
+                # Not certified: flag false or missing, or no certifications at all
                 query = query.filter(
                     or_(
-                        SubcontractorDirectory.certifications['mbe'].astext.cast(
-                            type_=type(False)
-                        ) == False,
-                        SubcontractorDirectory.certifications['mbe'].is_(None)
+                        ~self._certified('mbe'),
+                        SubcontractorDirectory.certifications.is_(None)
                     )
                 )
         
         # Filter by VSBE certification
         if filters.is_vsbe is not None:
             if filters.is_vsbe:
-                query = query.filter(
-                    SubcontractorDirectory.certifications['vsbe'].astext.cast(
-                        type_=type(True)
-                    ) == True
-                )
+                query = query.filter(self._certified('vsbe'))
         
         # Filter by verified status
         if filters.is_verified is not None:
@@ -100,13 +430,17 @@ class SubcontractorDirectoryService:
                 SubcontractorDirectory.rating >= filters.min_rating
             )
         
-        # Order by rating and projects completed
-        query = query.order_by(
-            SubcontractorDirectory.rating.desc(),
-            SubcontractorDirectory.projects_completed.desc()
-        )
-        
-        return query.all()
+        return query, relevance
+    
+    @staticmethod
+    def _certified(category: str):
+        """
+        certifications @> '{"<category>": true}'
+
+        Containment form so the jsonb_path_ops GIN index on certifications
+        can serve it (a cast of certifications->>'<category>' cannot)
+        """
+        return SubcontractorDirectory.certifications.contains({category: True})
     
     def get_all_subcontractors(
         self, 
@@ -134,6 +468,7 @@ class SubcontractorDirectoryService:
         
         self.db.commit()
         self.db.refresh(subcontractor)
+        self.match_index.upsert(subcontractor)
         return subcontractor
     
     def delete_subcontractor(self, subcontractor_id: UUID) -> bool:
@@ -145,6 +480,7 @@ class SubcontractorDirectoryService:
         
         self.db.delete(subcontractor)
         self.db.commit()
+        self.match_index.remove(subcontractor_id)
         return True
     
     def get_matching_subcontractors(
@@ -155,7 +491,22 @@ class SubcontractorDirectoryService:
         is_vsbe: bool = False,
         min_rating: float = 0.0
     ) -> List[SubcontractorDirectory]:
-        """Find subcontractors matching specific criteria for an opportunity"""
+        """
+        Find subcontractors matching specific criteria for an opportunity
+
+        With settings.DIRECTORY_MATCH_INDEX the match is served from the
+        in-process bitmap index (detached schema snapshots, best rated first).
+        """
+        if settings.DIRECTORY_MATCH_INDEX:
+            certifications = [
+                category for category, wanted in (('mbe', is_mbe), ('vsbe', is_vsbe)) if wanted
+            ]
+            matches = self.match_index.match(
+                self.db, naics_codes, jurisdiction_code, certifications, min_rating
+            )
+            if matches is not None:
+                return matches
+
         query = self.db.query(SubcontractorDirectory)
 
         # Match NAICS codes
@@ -171,14 +522,10 @@ class SubcontractorDirectoryService:
 
         # Match certifications
         if is_mbe:
-            query = query.filter(
-                SubcontractorDirectory.certifications['mbe'].astext.cast(Boolean) == True
-            )
+            query = query.filter(self._certified('mbe'))
 
         if is_vsbe:
-            query = query.filter(
-                SubcontractorDirectory.certifications['vsbe'].astext.cast(Boolean) == True
-            )
+            query = query.filter(self._certified('vsbe'))
 
         # Filter by rating
         query = query.filter(SubcontractorDirectory.rating >= min_rating)
@@ -188,6 +535,75 @@ class SubcontractorDirectoryService:
 
         return query.all()
 
+    def candidate_query(self, certifications: Iterable[str], min_rating: float = 0.0):
+        """
+        Column query for DirectoryCandidate rows certified in any of the
+        categories ('mbe', 'vsbe') and rated at least min_rating, best rated first
+        """
+        columns = [
+            getattr(SubcontractorDirectory, field)
+            for field in DirectoryCandidate._fields
+            if field not in ('is_mbe', 'is_vsbe')
+        ]
+        return self.db.query(
+            *columns,
+            self._certified('mbe').label('is_mbe'),
+            self._certified('vsbe').label('is_vsbe')
+        ).filter(
+            or_(*[self._certified(category) for category in certifications]),
+            SubcontractorDirectory.rating >= min_rating
+        ).order_by(SubcontractorDirectory.rating.desc(), SubcontractorDirectory.id)
+
+    def get_matching_candidates(
+        self,
+        naics_codes: List[str],
+        jurisdiction_code: str,
+        certifications: Iterable[str] = ('mbe', 'vsbe'),
+        min_rating: float = 0.0
+    ) -> List[DirectoryCandidate]:
+        """
+        Subcontractors matching an opportunity in any of the certification
+        categories, in one scan
+
+        Same criteria as get_matching_subcontractors, except a candidate needs
+        only one of the categories; its is_mbe/is_vsbe flags tell which. Only
+        the displayed columns are read, so no ORM entities are built.
+        """
+        certifications = list(certifications)
+        if not certifications:
+            return []
+
+        if settings.DIRECTORY_MATCH_INDEX:
+            matches = self.match_index.match(
+                self.db, naics_codes, jurisdiction_code, (), min_rating
+            )
+            if matches is not None:
+                candidates = []
+                for entry in matches:
+                    flags = {
+                        category: (entry.certifications or {}).get(category) is True
+                        for category in ('mbe', 'vsbe')
+                    }
+                    if any(flags[category] for category in certifications):
+                        candidates.append(DirectoryCandidate(
+                            *(getattr(entry, field) for field in DirectoryCandidate._fields[:-2]),
+                            is_mbe=flags['mbe'],
+                            is_vsbe=flags['vsbe']
+                        ))
+                return candidates
+
+        query = self.candidate_query(certifications, min_rating).filter(
+            SubcontractorDirectory.jurisdiction_codes.contains([jurisdiction_code])
+        )
+        if naics_codes:
+            query = query.filter(SubcontractorDirectory.naics_codes.overlap(naics_codes))
+
+        return [DirectoryCandidate(*row) for row in query.all()]
+
+    def get_match_index_stats(self) -> Dict:
+        """Load/match counters of the shared directory match index"""
+        return self.match_index.stats()
+
     def calculate_contractor_usage_count(self, subcontractor_id: UUID) -> int:
         """Calculate how many unique contractors have used this subcontractor"""
         from app.models import SubcontractorOutreach
@@ -210,20 +626,77 @@ class SubcontractorDirectoryService:
 
         self.db.commit()
         self.db.refresh(subcontractor)
+        self.match_index.upsert(subcontractor)
         return subcontractor
 
-    def update_all_contractor_usage_counts(self) -> int:
-        """Update contractor usage counts for all subcontractors in the directory"""
-        from app.models import SubcontractorOutreach
+    def update_all_contractor_usage_counts(self, chunk_size: Optional[int] = None) -> Dict:
+        """
+        Recompute contractor usage counts for the whole directory, set-based
+
+        One UPDATE ... FROM joins the directory to a per-subcontractor
+        COUNT(DISTINCT organization_id) over outreach and rewrites only the
+        counts that changed (entries with no outreach get 0). With chunk_size
+        the directory is walked in id order, chunk_size entries per UPDATE,
+        committing after each chunk to keep row locks short.
 
-        # Get all subcontractors
-        all_subs = self.db.query(SubcontractorDirectory).all()
+        Returns the number of entries whose count changed, the number of
+        chunks and the elapsed time in milliseconds.
+        """
+        started = time.perf_counter()
         updated_count = 0
+        chunks = 0
 
-        for sub in all_subs:
-            count = self.calculate_contractor_usage_count(sub.id)
-            sub.contractors_using_count = count
-            updated_count += 1
+        if chunk_size is None:
+            updated_count = self._recompute_usage_counts()
+            self.db.commit()
+            chunks = 1
+        else:
+            last_id = None
+            while True:
+                query = self.db.query(SubcontractorDirectory.id)
+                if last_id is not None:
+                    query = query.filter(SubcontractorDirectory.id > last_id)
+                ids = [row.id for row in query.order_by(SubcontractorDirectory.id).limit(chunk_size)]
+                if not ids:
+                    break
+                updated_count += self._recompute_usage_counts(ids)
+                self.db.commit()
+                chunks += 1
+                last_id = ids[-1]
 
-        self.db.commit()
-        return updated_count
\ No newline at end of file
+        if updated_count:
+            self.match_index.invalidate()
+
+        return {
+            "updated_count": updated_count,
+            "chunks": chunks,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def _recompute_usage_counts(self, ids: Optional[List[UUID]] = None) -> int:
+        """UPDATE ... FROM recount for the given directory ids (all if None); rows changed"""
+        from app.models import SubcontractorOutreach
+
+        counts = select(
+            SubcontractorOutreach.subcontractor_id,
+            func.count(func.distinct(SubcontractorOutreach.organization_id)).label("usage_count")
+        ).group_by(SubcontractorOutreach.subcontractor_id)
+
+        directory = aliased(SubcontractorDirectory)
+        source = select(directory.id)
+        if ids is not None:
+            counts = counts.where(SubcontractorOutreach.subcontractor_id.in_(ids))
+            source = source.where(directory.id.in_(ids))
+        counts = counts.subquery()
+        source = source.add_columns(
+            func.coalesce(counts.c.usage_count, 0).label("usage_count")
+        ).outerjoin(counts, counts.c.subcontractor_id == directory.id).subquery()
+
+        result = self.db.execute(
+            update(SubcontractorDirectory)
+            .where(SubcontractorDirectory.id == source.c.id)
+            .where(SubcontractorDirectory.contractors_using_count.is_distinct_from(source.c.usage_count))
+            .values(contractors_using_count=source.c.usage_count)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,11 +1,18 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
+from sqlalchemy import exists, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 from app.models import SubcontractorOutreach, SubcontractorDirectory, Opportunity
 from app.schemas.subcontractor_outreach import (
     SubcontractorOutreachCreate,
     SubcontractorOutreachUpdate
 )
+from app.services.subcontractor_directory_service import directory_match_index
+
+# One outreach record per organization, opportunity and subcontractor
+OUTREACH_UNIQUE_CONSTRAINT = "uq_subcontractor_outreach_org_opportunity_sub"
 
 class SubcontractorOutreachService:
     """Service for subcontractor outreach tracking"""
@@ -17,34 +24,74 @@ class SubcontractorOutreachService:
         self,
         outreach_data: SubcontractorOutreachCreate
     ) -> SubcontractorOutreach:
-        """Create a new outreach record"""
+        """
+        Create a new outreach record
+
+        Raises ValueError if the organization already has outreach to the
+        subcontractor for this opportunity.
+        """
         outreach = SubcontractorOutreach(**outreach_data.model_dump())
         self.db.add(outreach)
+        try:
+            self.db.flush()
+        except IntegrityError as e:
+            self.db.rollback()
+            if OUTREACH_UNIQUE_CONSTRAINT in str(e.orig):
+                raise ValueError(
+                    "Outreach already recorded for this organization, opportunity and subcontractor"
+                )
+            raise
+
+        # Auto-update contractor usage count for network effects, same transaction
+        usage_counts = self._adjust_usage_counts(
+            outreach.organization_id, [outreach.subcontractor_id], [outreach.id], 1
+        )
+
         self.db.commit()
+        directory_match_index.set_usage_counts(usage_counts)
         self.db.refresh(outreach)
-
-        # Auto-update contractor usage count for network effects
-        self._update_subcontractor_usage_count(outreach.subcontractor_id)
-
         return outreach
 
-    def _update_subcontractor_usage_count(self, subcontractor_id: UUID) -> None:
-        """Update the contractor usage count for a subcontractor after outreach changes"""
-        from sqlalchemy import func
-
-        # Calculate unique contractor count
-        count = self.db.query(func.count(func.distinct(SubcontractorOutreach.organization_id)))\
-            .filter(SubcontractorOutreach.subcontractor_id == subcontractor_id)\
-            .scalar()
-
-        # Update the subcontractor directory entry
-        subcontractor = self.db.query(SubcontractorDirectory)\
-            .filter(SubcontractorDirectory.id == subcontractor_id)\
-            .first()
+    def _adjust_usage_counts(
+        self,
+        organization_id: Optional[UUID],
+        subcontractor_ids: List[UUID],
+        outreach_ids: List[UUID],
+        delta: int
+    ) -> Dict[UUID, int]:
+        """
+        Apply a +1/-1 delta to contractors_using_count after outreach writes
+
+        contractors_using_count is the number of distinct organizations with
+        outreach to a subcontractor, so adding (or removing) the outreach rows
+        outreach_ids of one organization only changes it for subcontractors
+        that organization has no other outreach to. One UPDATE with a NOT
+        EXISTS probe instead of a COUNT(DISTINCT) per subcontractor; call it
+        after flushing the write, before committing. Concurrent first outreach
+        from the same organization can drift a count, which
+        update_all_contractor_usage_counts reconciles.
+
+        Returns the new count of every subcontractor that changed.
+        """
+        subcontractor_ids = [sub_id for sub_id in set(subcontractor_ids) if sub_id is not None]
+        if organization_id is None or not subcontractor_ids:
+            return {}
 
-        if subcontractor:
-            subcontractor.contractors_using_count = count or 0
-            self.db.commit()
+        other_outreach = exists().where(
+            SubcontractorOutreach.subcontractor_id == SubcontractorDirectory.id,
+            SubcontractorOutreach.organization_id == organization_id,
+            SubcontractorOutreach.id.notin_(outreach_ids)
+        )
+        result = self.db.execute(
+            update(SubcontractorDirectory)
+            .where(SubcontractorDirectory.id.in_(subcontractor_ids), ~other_outreach)
+            .values(contractors_using_count=func.greatest(
+                func.coalesce(SubcontractorDirectory.contractors_using_count, 0) + delta, 0
+            ))
+            .returning(SubcontractorDirectory.id, SubcontractorDirectory.contractors_using_count)
+            .execution_options(synchronize_session=False)
+        )
+        return {row.id: row.contractors_using_count for row in result}
     
     def get_outreach(self, outreach_id: UUID) -> Optional[SubcontractorOutreach]:
         """Get an outreach record by ID"""
@@ -115,39 +162,44 @@ class SubcontractorOutreachService:
         if not outreach:
             return False
 
-        subcontractor_id = outreach.subcontractor_id
-
         self.db.delete(outreach)
-        self.db.commit()
+        self.db.flush()
 
-        # Update contractor usage count after deletion
-        self._update_subcontractor_usage_count(subcontractor_id)
+        # Update contractor usage count after deletion, same transaction
+        usage_counts = self._adjust_usage_counts(
+            outreach.organization_id, [outreach.subcontractor_id], [outreach.id], -1
+        )
 
+        self.db.commit()
+        directory_match_index.set_usage_counts(usage_counts)
         return True
     
     def get_outreach_statistics(
         self,
         organization_id: Optional[UUID] = None,
-        opportunity_id: Optional[UUID] = None
+        opportunity_id: Optional[UUID] = None,
+        include_weekly: bool = False
     ) -> dict:
-        """Get statistics about outreach efforts"""
-        query = self.db.query(SubcontractorOutreach)
-
-        if organization_id:
-            query = query.filter(SubcontractorOutreach.organization_id == organization_id)
-
-        if opportunity_id:
-            query = query.filter(SubcontractorOutreach.opportunity_id == opportunity_id)
-
-        all_outreach = query.all()
-
-        total = len(all_outreach)
-        contacted = sum(1 for o in all_outreach if o.status == 'CONTACTED')
-        responded = sum(1 for o in all_outreach if o.status == 'RESPONDED')
-        committed = sum(1 for o in all_outreach if o.status == 'COMMITTED')
-        declined = sum(1 for o in all_outreach if o.status == 'DECLINED')
+        """
+        Get statistics about outreach efforts
 
-        return {
+        Counted in one aggregate query (COUNT ... FILTER per status) without
+        loading outreach rows. With include_weekly, adds a "weekly" series of
+        the same counts per week of contact_date, see get_weekly_outreach_statistics.
+        """
+        row = self._filtered_outreach(
+            self.db.query(*self._status_counts()),
+            organization_id,
+            opportunity_id
+        ).one()
+
+        total = row.total
+        contacted = row.contacted
+        responded = row.responded
+        committed = row.committed
+        declined = row.declined
+
+        statistics = {
             "total_outreach": total,
             "contacted": contacted,
             "responded": responded,
@@ -157,6 +209,67 @@ class SubcontractorOutreachService:
             "commit_rate": round(committed / total * 100, 2) if total > 0 else 0
         }
 
+        if include_weekly:
+            statistics["weekly"] = self.get_weekly_outreach_statistics(
+                organization_id=organization_id,
+                opportunity_id=opportunity_id
+            )
+
+        return statistics
+
+    def get_weekly_outreach_statistics(
+        self,
+        organization_id: Optional[UUID] = None,
+        opportunity_id: Optional[UUID] = None
+    ) -> List[dict]:
+        """
+        Outreach counts per week (Monday start) of contact_date, oldest first
+
+        Records are bucketed by when they were contacted and counted by their
+        current status, so a record contacted in one week and committed later
+        counts as committed in its contact week. Weeks without outreach are
+        omitted.
+        """
+        week = func.date_trunc('week', SubcontractorOutreach.contact_date).label("week")
+        rows = self._filtered_outreach(
+            self.db.query(week, *self._status_counts()),
+            organization_id,
+            opportunity_id
+        ).filter(
+            SubcontractorOutreach.contact_date.isnot(None)
+        ).group_by(week).order_by(week).all()
+
+        return [
+            {
+                "week_start": row.week.date(),
+                "total_outreach": row.total,
+                "contacted": row.contacted,
+                "responded": row.responded,
+                "committed": row.committed,
+                "declined": row.declined
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _status_counts() -> list:
+        """Total and per-status COUNT(*) FILTER (WHERE status = ...) columns"""
+        return [func.count().label("total")] + [
+            func.count().filter(SubcontractorOutreach.status == status).label(status.lower())
+            for status in ('CONTACTED', 'RESPONDED', 'COMMITTED', 'DECLINED')
+        ]
+
+    @staticmethod
+    def _filtered_outreach(query, organization_id: Optional[UUID], opportunity_id: Optional[UUID]):
+        """Restrict an outreach query to an organization and/or opportunity"""
+        if organization_id:
+            query = query.filter(SubcontractorOutreach.organization_id == organization_id)
+
+        if opportunity_id:
+            query = query.filter(SubcontractorOutreach.opportunity_id == opportunity_id)
+
+        return query
+
     def bulk_create_outreach_from_assessment(
         self,
         organization_id: UUID,
@@ -179,41 +292,63 @@ class SubcontractorOutreachService:
             notes: Optional notes to add to all records
 
         Returns:
-            List of created outreach records
+            List of created outreach records (existing combinations are skipped)
         """
         from datetime import date
 
-        outreach_records = []
-
-        for subcontractor_id in subcontractor_ids:
-            # Check if outreach already exists for this combination
-            existing = self.db.query(SubcontractorOutreach).filter(
+        # Unique, non-null ids in request order
+        subcontractor_ids = list(dict.fromkeys(
+            sub_id for sub_id in subcontractor_ids if sub_id is not None
+        ))
+        if not subcontractor_ids:
+            return []
+
+        # Skip subcontractors already tracked for this organization and opportunity
+        existing = {
+            row.subcontractor_id
+            for row in self.db.query(SubcontractorOutreach.subcontractor_id).filter(
                 SubcontractorOutreach.organization_id == organization_id,
                 SubcontractorOutreach.opportunity_id == opportunity_id,
-                SubcontractorOutreach.subcontractor_id == subcontractor_id
-            ).first()
-
-            if existing:
-                # Skip if already tracked
-                continue
-
-            outreach = SubcontractorOutreach(
-                organization_id=organization_id,
-                opportunity_id=opportunity_id,
-                subcontractor_id=subcontractor_id,
-                contact_date=date.today(),
-                status=initial_status,
-                notes=notes or f"Auto-created from pre-bid assessment"
+                SubcontractorOutreach.subcontractor_id.in_(subcontractor_ids)
             )
+        }
+        rows = [
+            {
+                "organization_id": organization_id,
+                "opportunity_id": opportunity_id,
+                "subcontractor_id": subcontractor_id,
+                "contact_date": date.today(),
+                "status": initial_status,
+                "notes": notes or f"Auto-created from pre-bid assessment"
+            }
+            for subcontractor_id in subcontractor_ids
+            if subcontractor_id not in existing
+        ]
+        if not rows:
+            return []
+
+        # One multi-row INSERT; ON CONFLICT covers records created concurrently
+        outreach_records = list(self.db.scalars(
+            insert(SubcontractorOutreach)
+            .values(rows)
+            .on_conflict_do_nothing(constraint=OUTREACH_UNIQUE_CONSTRAINT)
+            .returning(SubcontractorOutreach)
+        ))
+
+        # Count the organization once per newly reached subcontractor
+        usage_counts = self._adjust_usage_counts(
+            organization_id,
+            [outreach.subcontractor_id for outreach in outreach_records],
+            [outreach.id for outreach in outreach_records],
+            1
+        )
 
-            self.db.add(outreach)
-            outreach_records.append(outreach)
+        # Detach the RETURNING rows so the commit does not expire them (no refresh per row)
+        for outreach in outreach_records:
+            self.db.expunge(outreach)
 
         self.db.commit()
-
-        # Refresh all records to get IDs
-        for outreach in outreach_records:
-            self.db.refresh(outreach)
+        directory_match_index.set_usage_counts(usage_counts)
 
         return outreach_records
 
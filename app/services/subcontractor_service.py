@@ -1,21 +1,182 @@
-from typing import List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_
 from app.models import Subcontractor, Certification
 from app.schemas.subcontractor import SubcontractorCreate
+import itertools
+import threading
+import time
+
+# Distinguishes every NetworkCapacity built in this process
+_capacity_generations = itertools.count(1)
+
+class NetworkCapacity:
+    """
+    Certification capacity of one organization's network
+
+    A subcontractor counts toward a certification type when one of its
+    certifications contains the type (case-insensitive substring, so 'MBE'
+    matches 'MBE/DBE') and either lists one of the requested NAICS codes or
+    lists none; for MBE the subcontractor's is_mbe flag also counts. Each
+    type is indexed by NAICS code on first use, so later lookups are
+    dictionary hits and set unions.
+    """
+
+    def __init__(
+        self,
+        subcontractor_ids: Iterable[UUID],
+        mbe_flagged: Iterable[UUID],
+        certifications: Iterable[Tuple[UUID, str, object]]
+    ):
+        # Changes on every rebuild, so results derived from a capacity can be keyed on it
+        self.generation = next(_capacity_generations)
+        self.subcontractor_ids: FrozenSet[UUID] = frozenset(subcontractor_ids)
+        self._mbe_flagged: FrozenSet[UUID] = frozenset(mbe_flagged)
+        # (subcontractor ID, upper-cased cert type, NAICS codes as stored)
+        self._certifications = list(certifications)
+        # cert type -> (any matching cert, cert without NAICS codes, NAICS code -> IDs)
+        self._profiles: Dict[str, Tuple[Set[UUID], Set[UUID], Dict[object, Set[UUID]]]] = {}
+
+    @property
+    def total_count(self) -> int:
+        return len(self.subcontractor_ids)
+
+    def _profile(self, cert_type: str) -> Tuple[Set[UUID], Set[UUID], Dict[object, Set[UUID]]]:
+        """Subcontractor sets of one certification type, built on first use"""
+        profile = self._profiles.get(cert_type)
+        if profile is None:
+            certified, any_naics, by_naics = set(), set(), {}
+            for subcontractor_id, stored_type, naics_codes in self._certifications:
+                if cert_type not in stored_type:
+                    continue
+                certified.add(subcontractor_id)
+                if not naics_codes:
+                    any_naics.add(subcontractor_id)
+                elif isinstance(naics_codes, list):
+                    for code in naics_codes:
+                        if isinstance(code, (str, int)):
+                            by_naics.setdefault(code, set()).add(subcontractor_id)
+            if cert_type == 'MBE':
+                certified |= self._mbe_flagged
+                any_naics |= self._mbe_flagged
+            profile = (certified, any_naics, by_naics)
+            self._profiles[cert_type] = profile
+        return profile
+
+    def matching(self, cert_type: str, naics_codes: Optional[List[str]] = None) -> Set[UUID]:
+        """IDs of network subcontractors that count toward a certification type"""
+        certified, any_naics, by_naics = self._profile(cert_type.upper())
+        if not naics_codes:
+            return set(certified)
+        matched = set(any_naics)
+        for code in naics_codes:
+            matched |= by_naics.get(code, set())
+        return matched
+
+    def count(self, cert_type: str, naics_codes: Optional[List[str]] = None) -> int:
+        """Number of network subcontractors that count toward a certification type"""
+        return len(self.matching(cert_type, naics_codes))
+
+class NetworkCapacityIndex:
+    """
+    Process-wide cache of NetworkCapacity per organization
+
+    Built from one column query over the organization's subcontractors and
+    their certifications. Subcontractor writes through SubcontractorService
+    and BidService invalidate the organization's entry; loads that started
+    before an invalidation are not stored. Entries also expire after
+    max_age_seconds so other worker processes (and certification rows
+    written outside these services) are picked up.
+    """
+
+    def __init__(self, max_age_seconds: float = 300):
+        self.max_age_seconds = max_age_seconds
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: Dict[UUID, Tuple[float, NetworkCapacity]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, organization_id: UUID) -> NetworkCapacity:
+        """Capacity of an organization's network, loaded on a miss"""
+        with self._lock:
+            entry = self._entries.get(organization_id)
+            if entry and time.monotonic() - entry[0] < self.max_age_seconds:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = self.version
+
+        rows = db.query(
+            Subcontractor.id,
+            Subcontractor.is_mbe,
+            Certification.cert_type,
+            Certification.naics_codes
+        ).outerjoin(
+            Certification, Certification.subcontractor_id == Subcontractor.id
+        ).filter(
+            Subcontractor.organization_id == organization_id
+        ).all()
+
+        capacity = NetworkCapacity(
+            subcontractor_ids=[row.id for row in rows],
+            mbe_flagged=[row.id for row in rows if row.is_mbe],
+            certifications=[
+                (row.id, row.cert_type.upper(), row.naics_codes)
+                for row in rows
+                if row.cert_type
+            ]
+        )
+
+        with self._lock:
+            if version == self.version:
+                self._entries[organization_id] = (time.monotonic(), capacity)
+        return capacity
+
+    def invalidate(self, *organization_ids: Optional[UUID]) -> None:
+        """Drop the entries of organizations whose network changed (all if none given)"""
+        with self._lock:
+            self.version += 1
+            self.invalidations += 1
+            if organization_ids:
+                for organization_id in organization_ids:
+                    self._entries.pop(organization_id, None)
+            else:
+                self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "max_age_seconds": self.max_age_seconds
+            }
+
+
+# Shared by pre-bid assessments and the organization network routes
+network_capacity_index = NetworkCapacityIndex()
 
 class SubcontractorService:
     """Service for subcontractor operations"""
     
     def __init__(self, db: Session):
         self.db = db
+        self.network_index = network_capacity_index
     
     def create_subcontractor(self, subcontractor_data: SubcontractorCreate) -> Subcontractor:
         """Create a new subcontractor"""
         subcontractor = Subcontractor(**subcontractor_data.model_dump())
         self.db.add(subcontractor)
         self.db.commit()
+        self.network_index.invalidate(subcontractor.organization_id)
         self.db.refresh(subcontractor)
         return subcontractor
     
@@ -77,11 +238,13 @@ class SubcontractorService:
         if not subcontractor:
             return None
         
+        previous_organization_id = subcontractor.organization_id
         for key, value in update_data.items():
             if hasattr(subcontractor, key):
                 setattr(subcontractor, key, value)
         
         self.db.commit()
+        self.network_index.invalidate(previous_organization_id, subcontractor.organization_id)
         self.db.refresh(subcontractor)
         return subcontractor
     
@@ -94,6 +257,24 @@ class SubcontractorService:
         if not subcontractor:
             return False
         
+        organization_id = subcontractor.organization_id
         self.db.delete(subcontractor)
         self.db.commit()
-        return True
\ No newline at end of file
+        self.network_index.invalidate(organization_id)
+        return True
+
+    def get_network_capacity(
+        self,
+        organization_id: UUID,
+        cert_type: str,
+        naics_codes: Optional[List[str]] = None
+    ) -> Dict:
+        """Network subcontractors counting toward a certification type (cached)"""
+        matched = self.network_index.get(self.db, organization_id).matching(cert_type, naics_codes)
+        return {
+            "organization_id": organization_id,
+            "cert_type": cert_type.upper(),
+            "naics_codes": naics_codes or [],
+            "count": len(matched),
+            "subcontractor_ids": sorted(matched, key=str)
+        }
@@ -1,29 +1,142 @@
-from typing import List
+from typing import List, Dict, Iterator, Optional
 from uuid import UUID
+from datetime import datetime
+import uuid
 from sqlalchemy.orm import Session
 from app.models import ValidationResult
-from app.validation import ValidationEngine
-from app.schemas.validation import ValidationResponse
+from app.validation import ValidationEngine, ValidationTrace, ValidationContext
+from app.schemas.bid import BidCreate, BidSubcontractorCreate
+from app.schemas.validation import (
+    ValidationResponse,
+    ValidationSummary,
+    ValidationResult as ValidationResultSchema
+)
+from app.services.bid_service import BidService
 
 class ValidationService:
     """Service for validation operations"""
-    
+
     def __init__(self, db: Session):
         self.db = db
         self.engine = ValidationEngine(db)
-    
-    def validate_bid(self, bid_id: UUID) -> ValidationResponse:
-        """Validate a bid and return results"""
-        
+
+    def validate_bid(
+        self,
+        bid_id: UUID,
+        trace: bool = False,
+        incremental: bool = True
+    ) -> ValidationResponse:
+        """
+        Validate a bid and return results
+
+        trace: include rule decision records in the response
+        incremental: reuse stored results of rules whose inputs are unchanged
+        """
+        validation_trace = ValidationTrace(enabled=trace)
+
         # Run validation
-        results = self.engine.validate_bid(bid_id)
-        
+        results = self.engine.validate_bid(
+            bid_id, validation_trace, incremental=incremental
+        )
+        summary = self._summarize(bid_id, [r.status for r in results])
+
+        return ValidationResponse(
+            **summary.model_dump(),
+            validations=results,
+            trace=validation_trace.records if trace else None,
+            rule_timings_ms=self.engine.rule_timings
+        )
+
+    def preview_bid(
+        self,
+        bid_data: BidCreate,
+        subcontractors_data: List[BidSubcontractorCreate],
+        trace: bool = False
+    ) -> ValidationResponse:
+        """
+        Validate an unsaved bid and team entirely in memory
+
+        Runs the same rules as validate_bid against a transient bid; nothing
+        is written and validation_results is not touched. The bid and result
+        IDs in the response are generated for this preview only.
+        Raises ValueError if a subcontractor cannot be resolved.
+        """
+        validation_trace = ValidationTrace(enabled=trace)
+
+        bid = BidService(self.db).build_preview_bid(bid_data, subcontractors_data)
+        context = ValidationContext.load_for_bids(self.db, [bid], validation_trace)[0]
+        rule_results = self.engine.run_rules(context)
+
+        created_at = datetime.utcnow()
+        results = [
+            ValidationResultSchema(
+                id=uuid.uuid4(),
+                bid_id=bid.id,
+                rule_name=rule.name,
+                status=result_data["status"],
+                error_message=result_data["error_message"],
+                created_at=created_at
+            )
+            for rule, result_data in rule_results
+        ]
+        summary = self._summarize(bid.id, [r.status for r in results])
+
+        return ValidationResponse(
+            **summary.model_dump(),
+            validations=results,
+            trace=validation_trace.records if trace else None,
+            rule_timings_ms=self.engine.rule_timings
+        )
+
+    def validate_bids_stream(
+        self,
+        bid_ids: Optional[List[UUID]] = None,
+        organization_id: Optional[UUID] = None
+    ) -> Iterator[Dict]:
+        """
+        Validate many bids in one pass, yielding a summary per bid as it finishes
+
+        All bids and their reference data are loaded with a fixed number of
+        queries. Results are written with a single bulk delete + insert once
+        every bid has been validated; the last item yielded reports the totals.
+        Requested bid IDs that do not exist are reported as NOT_FOUND.
+        """
+        contexts = ValidationContext.load_many(self.db, bid_ids, organization_id)
+        results_by_bid = {}
+        fingerprints_by_bid = {}
+
+        for context in contexts:
+            rule_results = self.engine.run_rules(context)
+            results_by_bid[context.bid.id] = rule_results
+            fingerprints_by_bid[context.bid.id] = self.engine.fingerprint_rules(context)
+
+            summary = self._summarize(
+                context.bid.id,
+                [result_data["status"] for _, result_data in rule_results]
+            )
+            yield summary.model_dump(mode="json")
+
+        for bid_id in bid_ids or []:
+            if bid_id not in results_by_bid:
+                yield {"bid_id": str(bid_id), "overall_status": "NOT_FOUND"}
+
+        saved = self.engine.save_results(results_by_bid, fingerprints_by_bid)
+
+        yield {
+            "complete": True,
+            "bids_validated": len(results_by_bid),
+            "results_saved": saved
+        }
+
+    @staticmethod
+    def _summarize(bid_id: UUID, statuses: List[str]) -> ValidationSummary:
+        """Count rule outcomes and determine the overall status"""
         # Calculate statistics
-        total = len(results)
-        passed = sum(1 for r in results if r.status == "PASS")
-        failed = sum(1 for r in results if r.status == "FAIL")
-        warnings = sum(1 for r in results if r.status == "WARNING")
-        
+        total = len(statuses)
+        passed = sum(1 for s in statuses if s == "PASS")
+        failed = sum(1 for s in statuses if s == "FAIL")
+        warnings = sum(1 for s in statuses if s == "WARNING")
+
         # Determine overall status
         if failed > 0:
             overall_status = "FAIL"
@@ -31,19 +144,18 @@ class ValidationService:
             overall_status = "WARNING"
         else:
             overall_status = "PASS"
-        
-        return ValidationResponse(
+
+        return ValidationSummary(
             bid_id=bid_id,
             overall_status=overall_status,
             total_validations=total,
             passed=passed,
             failed=failed,
-            warnings=warnings,
-            validations=results
+            warnings=warnings
         )
-    
+
     def get_validation_results(self, bid_id: UUID) -> List[ValidationResult]:
         """Get validation results for a bid"""
         return self.db.query(ValidationResult).filter(
             ValidationResult.bid_id == bid_id
-        ).order_by(ValidationResult.created_at.desc()).all()
\ No newline at end of file
+        ).order_by(ValidationResult.created_at.desc()).all()
@@ -1,4 +1,7 @@
 from app.validation.engine import ValidationEngine
 from app.validation.rules import ALL_RULES
+from app.validation.context import ValidationContext
+from app.validation.participation import CategoryParticipation
+from app.validation.trace import ValidationTrace
 
-__all__ = ["ValidationEngine", "ALL_RULES"]
\ No newline at end of file
+__all__ = ["ValidationEngine", "ALL_RULES", "ValidationContext", "CategoryParticipation", "ValidationTrace"]
@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional, Tuple
+from decimal import Decimal
+
+# (failure message or None, trace message or None, trace details)
+EvaluationResult = Tuple[Optional[str], Optional[str], Dict]
+
+class ComplianceEvaluator:
+    """
+    A compliance rule compiled from its rule_definition JSONB
+
+    Built once when rules are loaded into the compliance rule cache, so the
+    threshold is parsed a single time and checking a bid is a comparison
+    against the context's precomputed participation totals.
+    """
+
+    def __init__(self, rule):
+        rule_def = rule.rule_definition or {}
+        self.rule_id = rule.id
+        self.rule_name = rule.rule_name
+        self.rule_type = rule.rule_type
+        self.severity = rule.severity
+        self.jurisdiction_code = rule.jurisdiction.code if rule.jurisdiction else None
+        self.threshold = Decimal(str(rule_def.get('threshold', 0)))
+
+    def evaluate(self, context) -> EvaluationResult:
+        """Return (failure message or None, trace message, trace details) for a bid"""
+        raise NotImplementedError
+
+    def _below_threshold(self, label: str, total: Decimal, count: int, denominator: Decimal) -> EvaluationResult:
+        """Shared percentage-vs-threshold check"""
+        percentage = (total / denominator) * 100
+        details = {"total": total, "entries": count}
+        trace_message = f"{label} participation {percentage:.2f}% (required: {self.threshold}%)"
+
+        if percentage < self.threshold:
+            return (
+                f"{self.rule_name}: {label} participation {percentage:.2f}% is below required {self.threshold}%",
+                trace_message,
+                details
+            )
+
+        return None, trace_message, details
+
+    def _skip_zero_total(self, context, label: str) -> Optional[EvaluationResult]:
+        """Rules cannot compute a percentage of a zero bid total"""
+        if not context.bid.total_amount or context.bid.total_amount == 0:
+            return None, f"WARNING: bid total_amount is 0 or None, skipping {label} check", {}
+        return None
+
+
+class MBEComplianceEvaluator(ComplianceEvaluator):
+    """MBE share: breakdown entries (no certification check) or counts_toward_mbe, over the team total"""
+
+    def evaluate(self, context) -> EvaluationResult:
+        skipped = self._skip_zero_total(context, "MBE")
+        if skipped:
+            return skipped
+
+        participation = context.participation
+        total = participation.breakdown['mbe'] + participation.flagged_mbe
+        count = participation.breakdown_counts['mbe'] + participation.flagged_mbe_count
+        denominator = participation.subcontract_sum or context.bid.total_amount
+
+        return self._below_threshold("MBE", total, count, denominator)
+
+
+class CategoryComplianceEvaluator(ComplianceEvaluator):
+    """Category share: breakdown entries or directory certification, over the bid total"""
+
+    def __init__(self, rule, category: str):
+        super().__init__(rule)
+        self.category = category
+        self.label = category.upper()
+
+    def evaluate(self, context) -> EvaluationResult:
+        skipped = self._skip_zero_total(context, self.label)
+        if skipped:
+            return skipped
+
+        participation = context.participation
+        total = participation.breakdown[self.category] + participation.certified[self.category]
+        count = participation.breakdown_counts[self.category] + participation.certified_counts[self.category]
+
+        return self._below_threshold(self.label, total, count, context.bid.total_amount)
+
+
+class LocalPreferenceEvaluator(ComplianceEvaluator):
+    """
+    Local business share: subcontract value of subcontractors whose directory
+    entry lists the rule's jurisdiction, over the bid total
+    """
+
+    def evaluate(self, context) -> EvaluationResult:
+        skipped = self._skip_zero_total(context, "local preference")
+        if skipped:
+            return skipped
+
+        participation = context.participation
+        total = participation.local_amounts.get(self.jurisdiction_code, Decimal('0'))
+        count = participation.local_counts.get(self.jurisdiction_code, 0)
+
+        return self._below_threshold("Local business", total, count, context.bid.total_amount)
+
+
+class UnsupportedRuleEvaluator(ComplianceEvaluator):
+    """Rule types the validator does not check always pass"""
+
+    def evaluate(self, context) -> EvaluationResult:
+        return None, None, {}
+
+
+def compile_rule(rule) -> ComplianceEvaluator:
+    """Compile a compliance rule (model or schema) into its evaluator"""
+    if rule.rule_type == "MBE":
+        return MBEComplianceEvaluator(rule)
+    elif rule.rule_type == "VSBE":
+        return CategoryComplianceEvaluator(rule, 'vsbe')
+    elif rule.rule_type == "DBE":
+        return CategoryComplianceEvaluator(rule, 'dbe')
+    elif rule.rule_type == "LOCAL_PREF":
+        return LocalPreferenceEvaluator(rule)
+
+    return UnsupportedRuleEvaluator(rule)
+
+
+def compile_rules(rules: List) -> List[ComplianceEvaluator]:
+    """Compile a list of compliance rules, keeping their order"""
+    return [compile_rule(rule) for rule in rules]
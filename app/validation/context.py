@@ -0,0 +1,195 @@
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload
+from app.models import (
+    Bid,
+    BidSubcontractor,
+    Subcontractor,
+    SubcontractorDirectory
+)
+from app.schemas.jurisdiction import Jurisdiction
+from app.schemas.compliance_rule import ComplianceRuleDetail
+from app.validation.trace import ValidationTrace, DISABLED_TRACE
+from app.validation.participation import CategoryParticipation
+from app.validation.compliance import ComplianceEvaluator
+
+class ValidationContext:
+    """
+    Everything the validation rules need for a single bid, loaded up front
+
+    Built with a fixed number of bulk queries (bid + team, directory entries;
+    jurisdictions and compliance rules come from the shared cache) so the
+    cost of validating a bid does not grow with the number of subcontractors
+    on it. Rules read from the context instead of querying the database
+    themselves. Category participation totals are accumulated once here and
+    shared by all rules.
+    """
+
+    def __init__(
+        self,
+        bid: Bid,
+        directory_entries: Dict[str, SubcontractorDirectory],
+        directory_entries_by_id: Dict[UUID, SubcontractorDirectory],
+        jurisdictions: List[Jurisdiction],
+        compliance_rules: Dict[UUID, List[ComplianceRuleDetail]],
+        compliance_evaluators: Dict[UUID, List[ComplianceEvaluator]],
+        trace: ValidationTrace = DISABLED_TRACE
+    ):
+        self.bid = bid
+        self.subcontractors: Dict[UUID, Subcontractor] = {
+            bid_sub.subcontractor_id: bid_sub.subcontractor
+            for bid_sub in bid.bid_subcontractors
+            if bid_sub.subcontractor is not None
+        }
+        self.directory_entries = directory_entries
+        self.directory_entries_by_id = directory_entries_by_id
+        self.jurisdictions = jurisdictions
+        self.compliance_rules = compliance_rules
+        self.compliance_evaluators = compliance_evaluators
+        self.trace = trace
+        self.participation = CategoryParticipation.from_context(self)
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        bid_id: UUID,
+        trace: ValidationTrace = DISABLED_TRACE
+    ) -> "ValidationContext":
+        """Load a bid and all data referenced by the validation rules"""
+        bid = cls._bid_query(db).filter(Bid.id == bid_id).first()
+
+        if not bid:
+            raise ValueError(f"Bid {bid_id} not found")
+
+        return cls.load_for_bids(db, [bid], trace)[0]
+
+    @classmethod
+    def load_many(
+        cls,
+        db: Session,
+        bid_ids: Optional[List[UUID]] = None,
+        organization_id: Optional[UUID] = None
+    ) -> List["ValidationContext"]:
+        """
+        Load contexts for many bids (by ID list and/or organization) at once
+
+        Uses the same fixed number of queries as a single bid; the directory
+        entries, jurisdictions and compliance rules are shared between contexts.
+        """
+        query = cls._bid_query(db)
+
+        if bid_ids:
+            query = query.filter(Bid.id.in_(bid_ids))
+
+        if organization_id:
+            query = query.filter(Bid.organization_id == organization_id)
+
+        return cls.load_for_bids(db, query.all())
+
+    @staticmethod
+    def _bid_query(db: Session):
+        """Bid query with the team and organization subcontractors eagerly loaded"""
+        return db.query(Bid).options(
+            joinedload(Bid.bid_subcontractors).joinedload(BidSubcontractor.subcontractor)
+        )
+
+    @classmethod
+    def load_for_bids(
+        cls,
+        db: Session,
+        bids: List[Bid],
+        trace: ValidationTrace = DISABLED_TRACE
+    ) -> List["ValidationContext"]:
+        """Bulk-load the reference data for already loaded bids and build their contexts"""
+        # Linked subcontractors are looked up by directory_id, the rest by legal name
+        directory_ids = set()
+        legal_names = set()
+        for bid in bids:
+            for bid_sub in bid.bid_subcontractors:
+                subcontractor = bid_sub.subcontractor
+                if subcontractor is None:
+                    continue
+                if subcontractor.directory_id:
+                    directory_ids.add(subcontractor.directory_id)
+                else:
+                    legal_names.add(subcontractor.legal_name)
+
+        # One indexed query: primary key for linked entries, legal_name index otherwise
+        conditions = []
+        if directory_ids:
+            conditions.append(SubcontractorDirectory.id.in_(directory_ids))
+        if legal_names:
+            conditions.append(SubcontractorDirectory.legal_name.in_(legal_names))
+
+        directory_entries = {}
+        directory_entries_by_id = {}
+        if conditions:
+            for entry in db.query(SubcontractorDirectory).filter(or_(*conditions)).all():
+                directory_entries_by_id[entry.id] = entry
+                # Keyed by legal name for unlinked subcontractors (first match wins, as before)
+                directory_entries.setdefault(entry.legal_name, entry)
+
+        jurisdiction_codes = set()
+        for entry in directory_entries_by_id.values():
+            if entry.jurisdiction_codes:
+                jurisdiction_codes.update(entry.jurisdiction_codes)
+
+        # Jurisdictions and their rules come from the shared compliance rule cache
+        from app.services.compliance_rule_service import ComplianceRuleService
+
+        jurisdictions = []
+        compliance_rules = {}
+        compliance_evaluators = {}
+        cached = ComplianceRuleService(db).get_cached_jurisdictions(sorted(jurisdiction_codes))
+        for jurisdiction, rules, evaluators in cached.values():
+            if jurisdiction is not None:
+                jurisdictions.append(jurisdiction)
+                compliance_rules[jurisdiction.id] = rules
+                compliance_evaluators[jurisdiction.id] = evaluators
+
+        return [
+            cls(
+                bid,
+                directory_entries,
+                directory_entries_by_id,
+                jurisdictions,
+                compliance_rules,
+                compliance_evaluators,
+                trace
+            )
+            for bid in bids
+        ]
+
+    def get_subcontractor(self, bid_sub: BidSubcontractor) -> Optional[Subcontractor]:
+        """Get the organization subcontractor for a bid subcontractor"""
+        return self.subcontractors.get(bid_sub.subcontractor_id)
+
+    def get_directory_entry(
+        self,
+        subcontractor: Optional[Subcontractor]
+    ) -> Optional[SubcontractorDirectory]:
+        """Get the directory entry linked to a subcontractor, or matching its legal name"""
+        if subcontractor is None:
+            return None
+        if subcontractor.directory_id:
+            return self.directory_entries_by_id.get(subcontractor.directory_id)
+        return self.directory_entries.get(subcontractor.legal_name)
+
+    def get_jurisdiction_codes(self) -> Set[str]:
+        """Unique jurisdiction codes across the team's directory entries"""
+        codes = set()
+        for bid_sub in self.bid.bid_subcontractors:
+            entry = self.get_directory_entry(self.get_subcontractor(bid_sub))
+            if entry and entry.jurisdiction_codes:
+                codes.update(entry.jurisdiction_codes)
+        return codes
+
+    def get_compliance_rules(self, jurisdiction: Jurisdiction) -> List[ComplianceRuleDetail]:
+        """Get the compliance rules loaded for a jurisdiction"""
+        return self.compliance_rules.get(jurisdiction.id, [])
+
+    def get_compliance_evaluators(self, jurisdiction: Jurisdiction) -> List[ComplianceEvaluator]:
+        """Get the compiled compliance rules for a jurisdiction"""
+        return self.compliance_evaluators.get(jurisdiction.id, [])
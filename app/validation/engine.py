@@ -1,8 +1,12 @@
-from typing import List
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models import Bid, ValidationResult
-from app.validation.rules import ALL_RULES
+from app.validation.rules import ALL_RULES, ValidationRule
+from app.validation.context import ValidationContext
+from app.validation.trace import ValidationTrace, DISABLED_TRACE
 from uuid import UUID
+import time
 
 class ValidationEngine:
     """
@@ -18,8 +22,15 @@ class ValidationEngine:
 
     def __init__(self, db: Session):
         self.db = db
+        # Per-rule execution time (ms) of the last validate_bid call
+        self.rule_timings: Dict[str, float] = {}
 
-    def validate_bid(self, bid_id: UUID) -> List[ValidationResult]:
+    def validate_bid(
+        self,
+        bid_id: UUID,
+        trace: ValidationTrace = DISABLED_TRACE,
+        incremental: bool = True
+    ) -> List[ValidationResult]:
         """
         Run all validation rules on a bid
 
@@ -30,39 +41,159 @@ class ValidationEngine:
         - Amount counting for percentage calculations (verified from directory DB)
 
         NOTE: NAICS code validation is disabled
+
+        Pass an enabled ValidationTrace to collect per-rule decision records.
+
+        With incremental=True (the default) a rule whose input fingerprint
+        matches the one stored with its previous result is not rerun; the
+        stored ValidationResult is returned as is.
         """
-        
-        # Get the bid with all relationships
-        bid = self.db.query(Bid).filter(Bid.id == bid_id).first()
-        
-        if not bid:
-            raise ValueError(f"Bid {bid_id} not found")
-        
-        # Clear previous validation results
-        self.db.query(ValidationResult).filter(
+
+        # Load the bid and everything the rules need in a fixed number of queries
+        context = ValidationContext.load(self.db, bid_id, trace)
+        fingerprints = self.fingerprint_rules(context)
+
+        previous = self.db.query(ValidationResult).filter(
             ValidationResult.bid_id == bid_id
-        ).delete()
-        
+        ).all()
+
+        # Reuse stored results whose inputs have not changed
+        reusable = {}
+        if incremental:
+            for result in previous:
+                if (
+                    result.input_fingerprint
+                    and result.input_fingerprint == fingerprints.get(result.rule_name)
+                    and result.rule_name not in reusable
+                ):
+                    reusable[result.rule_name] = result
+
+        rules_to_run = [rule for rule in ALL_RULES if rule.name not in reusable]
+        for rule in ALL_RULES:
+            if rule.name in reusable:
+                rule.trace(context, "SKIPPED: inputs unchanged since last validation")
+
+        # Evaluate the rules before touching the session again
+        rule_results = {
+            rule.name: result_data
+            for rule, result_data in self.run_rules(context, rules_to_run)
+        }
+
+        # Clear stale validation results
+        reused_ids = {result.id for result in reusable.values()}
+        stale = [result for result in previous if result.id not in reused_ids]
+        for result in stale:
+            self.db.delete(result)
+
         results = []
-        
-        # Run each validation rule
+        new_results = []
+
         for rule in ALL_RULES:
-            result_data = rule.validate(bid, self.db)
-            
+            if rule.name in reusable:
+                results.append(reusable[rule.name])
+                continue
+
+            result_data = rule_results[rule.name]
             validation_result = ValidationResult(
                 bid_id=bid_id,
                 rule_name=rule.name,
                 status=result_data["status"],
-                error_message=result_data["error_message"]
+                error_message=result_data["error_message"],
+                input_fingerprint=fingerprints[rule.name]
             )
-            
+
             self.db.add(validation_result)
             results.append(validation_result)
-        
+            new_results.append(validation_result)
+
+        # Nothing changed: no writes at all
+        if not stale and not new_results:
+            return results
+
+        # Reused rows are unchanged; detach them so the commit does not expire
+        # them and they are not reloaded one by one
+        for result in reusable.values():
+            self.db.expunge(result)
+
         self.db.commit()
-        
+
         # Refresh to get created_at timestamps
-        for result in results:
+        for result in new_results:
             self.db.refresh(result)
-        
-        return results
\ No newline at end of file
+
+        return results
+
+    @staticmethod
+    def fingerprint_rules(context: ValidationContext) -> Dict[str, str]:
+        """Input fingerprint of every rule for a loaded context"""
+        return {rule.name: rule.fingerprint(context) for rule in ALL_RULES}
+
+    def save_results(
+        self,
+        results_by_bid: Dict[UUID, List[Tuple[ValidationRule, Dict]]],
+        fingerprints_by_bid: Optional[Dict[UUID, Dict[str, str]]] = None
+    ) -> int:
+        """
+        Replace the stored validation results for many bids at once
+
+        One DELETE for all bids and one multi-row INSERT for all new rows,
+        committed together. Returns the number of rows written.
+        Fingerprints, when given, are stored for incremental revalidation.
+        """
+        fingerprints_by_bid = fingerprints_by_bid or {}
+
+        if not results_by_bid:
+            return 0
+
+        self.db.query(ValidationResult).filter(
+            ValidationResult.bid_id.in_(list(results_by_bid.keys()))
+        ).delete(synchronize_session=False)
+
+        rows = [
+            {
+                "bid_id": bid_id,
+                "rule_name": rule.name,
+                "status": result_data["status"],
+                "error_message": result_data["error_message"],
+                "input_fingerprint": fingerprints_by_bid.get(bid_id, {}).get(rule.name)
+            }
+            for bid_id, rule_results in results_by_bid.items()
+            for rule, result_data in rule_results
+        ]
+
+        if rows:
+            self.db.execute(insert(ValidationResult), rows)
+
+        self.db.commit()
+        return len(rows)
+
+    def run_rules(
+        self,
+        context: ValidationContext,
+        rules: Optional[List[ValidationRule]] = None
+    ) -> List[Tuple[ValidationRule, Dict]]:
+        """
+        Evaluate rules (default ALL_RULES) against a context without touching the database
+
+        Returns (rule, result_data) pairs in rule order and records each
+        rule's execution time in rule_timings.
+        """
+        rules = ALL_RULES if rules is None else rules
+        self.rule_timings = {}
+
+        rule_results = []
+        for rule in rules:
+            result_data, elapsed_ms = self._timed_validate(rule, context)
+            self.rule_timings[rule.name] = elapsed_ms
+            rule_results.append((rule, result_data))
+        return rule_results
+
+    @staticmethod
+    def _timed_validate(
+        rule: ValidationRule,
+        context: ValidationContext
+    ) -> Tuple[Dict, float]:
+        """Run a single rule and measure how long it took in milliseconds"""
+        started = time.perf_counter()
+        result_data = rule.validate(context)
+        return result_data, round((time.perf_counter() - started) * 1000, 3)
@@ -0,0 +1,107 @@
+from typing import Dict, List, Tuple
+from decimal import Decimal
+
+# Categories tracked for participation goals
+CATEGORIES = ('mbe', 'vsbe', 'wbe', 'sbe', 'dbe', 'cbe')
+
+class CategoryParticipation:
+    """
+    Per-category participation amounts for a bid team, computed in one pass
+
+    The MBE/VSBE/DBE compliance checks, MBEPercentageRule and
+    JurisdictionSpecificGoalRule all read these totals instead of walking the
+    team and re-parsing category_breakdown percentages themselves.
+
+    Amounts for subcontractors with a category_breakdown:
+    - breakdown: first breakdown entry of the category, no certification check
+    - certified_breakdown_first: same, only if the directory certifies the category
+    - certified_breakdown: every breakdown entry of the category the directory certifies
+
+    Amounts for subcontractors without a category_breakdown:
+    - certified: full subcontract value when the directory certifies the category
+    - flagged_mbe: full subcontract value when counts_toward_mbe and MBE certified
+
+    local_amounts: subcontract value per jurisdiction code listed on the directory entry
+    """
+
+    def __init__(self):
+        self.breakdown: Dict[str, Decimal] = self._zeros()
+        self.breakdown_counts: Dict[str, int] = dict.fromkeys(CATEGORIES, 0)
+        self.certified_breakdown_first: Dict[str, Decimal] = self._zeros()
+        self.certified_breakdown: Dict[str, Decimal] = self._zeros()
+        self.certified: Dict[str, Decimal] = self._zeros()
+        self.certified_counts: Dict[str, int] = dict.fromkeys(CATEGORIES, 0)
+        self.flagged_mbe = Decimal('0')
+        self.flagged_mbe_count = 0
+        self.subcontract_sum = Decimal('0')
+        self.local_amounts: Dict[str, Decimal] = {}
+        self.local_counts: Dict[str, int] = {}
+        # (legal_name, category, reason) of breakdown entries not counted for lack of certification
+        self.uncertified_entries: List[Tuple[str, str, str]] = []
+
+    @staticmethod
+    def _zeros() -> Dict[str, Decimal]:
+        return {category: Decimal('0') for category in CATEGORIES}
+
+    @classmethod
+    def from_context(cls, context) -> "CategoryParticipation":
+        """Walk the bid team once and accumulate every category total"""
+        totals = cls()
+        hundred = Decimal('100')
+
+        for bid_sub in context.bid.bid_subcontractors:
+            # Summed over the whole team, as the rules always have
+            totals.subcontract_sum += bid_sub.subcontract_value
+
+            subcontractor = context.get_subcontractor(bid_sub)
+            if not subcontractor:
+                continue
+
+            directory_entry = context.get_directory_entry(subcontractor)
+            certifications = directory_entry.certifications if directory_entry else None
+
+            if directory_entry and directory_entry.jurisdiction_codes:
+                for code in set(directory_entry.jurisdiction_codes):
+                    totals.local_amounts.setdefault(code, Decimal('0'))
+                    totals.local_amounts[code] += bid_sub.subcontract_value
+                    totals.local_counts[code] = totals.local_counts.get(code, 0) + 1
+
+            if bid_sub.category_breakdown:
+                seen = set()
+                for entry in bid_sub.category_breakdown:
+                    category = entry.get('category', '').lower()
+                    if category not in totals.breakdown:
+                        continue
+
+                    percentage = Decimal(str(entry.get('percentage', 0)))
+                    allocated_amount = bid_sub.subcontract_value * (percentage / hundred)
+                    first = category not in seen
+                    seen.add(category)
+
+                    if first:
+                        totals.breakdown[category] += allocated_amount
+                        totals.breakdown_counts[category] += 1
+
+                    if not certifications:
+                        totals.uncertified_entries.append(
+                            (subcontractor.legal_name, category, "no directory entry or certifications")
+                        )
+                    elif certifications.get(category, False):
+                        totals.certified_breakdown[category] += allocated_amount
+                        if first:
+                            totals.certified_breakdown_first[category] += allocated_amount
+                    else:
+                        totals.uncertified_entries.append(
+                            (subcontractor.legal_name, category, "not certified in directory")
+                        )
+            elif certifications:
+                for category in CATEGORIES:
+                    if certifications.get(category, False):
+                        totals.certified[category] += bid_sub.subcontract_value
+                        totals.certified_counts[category] += 1
+
+                if bid_sub.counts_toward_mbe and certifications.get('mbe', False):
+                    totals.flagged_mbe += bid_sub.subcontract_value
+                    totals.flagged_mbe_count += 1
+
+        return totals
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Optional
+
+class ValidationTrace:
+    """
+    In-memory collector for validation rule decisions
+
+    Disabled by default so validation does no extra work in normal requests.
+    When enabled (e.g. ?trace=true on /bids/{bid_id}/validate) rules append
+    structured decision records that are returned with the validation
+    response instead of being written to stdout.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.records: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        rule_name: str,
+        message: str,
+        subject: Optional[str] = None,
+        **details: Any
+    ) -> None:
+        """Record a rule decision (no-op when tracing is disabled)"""
+        if not self.enabled:
+            return
+
+        self.records.append({
+            "rule_name": rule_name,
+            "subject": subject,
+            "message": message,
+            "details": details
+        })
+
+
+# Shared no-op trace used when the caller does not ask for tracing
+DISABLED_TRACE = ValidationTrace(enabled=False)
@@ -0,0 +1,55 @@
+"""
+Migration script to index pre_bid_assessments for the per-organization assessment summary
+"""
+import psycopg
+
+from app.config import settings
+
+def run_migration():
+    """Run the migration to add the pre-bid assessment summary index"""
+
+    # Parse the database URL
+    db_url = settings.DATABASE_URL
+
+    # Connect to the database
+    try:
+        print("Connecting to database...")
+        conn = psycopg.connect(db_url)
+        cursor = conn.cursor()
+
+        print("Running migration: Adding pre_bid_assessments (organization_id, assessed_at) index...")
+
+        # Read the SQL migration file
+        with open('add_assessment_summary_index.sql', 'r') as f:
+            cursor.execute(f.read())
+
+        # Commit the changes
+        conn.commit()
+
+        print("[SUCCESS] Migration completed successfully!")
+
+        # Verify the indexes were created
+        cursor.execute("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'pre_bid_assessments'
+            AND indexname IN (
+                'idx_pre_bid_assessments_org_assessed_at'
+            );
+        """)
+
+        for row in cursor.fetchall():
+            print(f"[SUCCESS] Verified index exists: {row[0]}")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"[ERROR] Error running migration: {e}")
+        if 'conn' in locals():
+            conn.rollback()
+            conn.close()
+        raise
+
+if __name__ == "__main__":
+    run_migration()
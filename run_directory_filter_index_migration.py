@@ -0,0 +1,58 @@
+"""
+Migration script to add GIN indexes for subcontractor_directory array/JSONB filters
+"""
+import psycopg
+
+from app.config import settings
+
+def run_migration():
+    """Run the migration to add the directory filter indexes"""
+
+    # Parse the database URL
+    db_url = settings.DATABASE_URL
+
+    # Connect to the database
+    try:
+        print("Connecting to database...")
+        conn = psycopg.connect(db_url)
+        cursor = conn.cursor()
+
+        print("Running migration: Adding GIN indexes on jurisdiction_codes, naics_codes and certifications...")
+
+        # Read the SQL migration file
+        with open('add_directory_filter_indexes.sql', 'r') as f:
+            cursor.execute(f.read())
+
+        # Commit the changes
+        conn.commit()
+
+        print("[SUCCESS] Migration completed successfully!")
+        print("[SUCCESS] Added filter indexes to subcontractor_directory table")
+
+        # Verify the indexes were created
+        cursor.execute("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'subcontractor_directory'
+            AND indexname IN (
+                'idx_subcontractor_directory_jurisdiction_codes',
+                'idx_subcontractor_directory_naics_codes',
+                'idx_subcontractor_directory_certifications'
+            );
+        """)
+
+        for row in cursor.fetchall():
+            print(f"[SUCCESS] Verified index exists: {row[0]}")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"[ERROR] Error running migration: {e}")
+        if 'conn' in locals():
+            conn.rollback()
+            conn.close()
+        raise
+
+if __name__ == "__main__":
+    run_migration()
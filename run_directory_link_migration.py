@@ -0,0 +1,63 @@
+"""
+Migration script to add directory_id column to subcontractors table
+and index subcontractor_directory.legal_name
+"""
+import psycopg
+
+from app.config import settings
+
+def run_migration():
+    """Run the migration to link subcontractors to directory entries"""
+
+    # Parse the database URL
+    db_url = settings.DATABASE_URL
+
+    # Connect to the database
+    try:
+        print("Connecting to database...")
+        conn = psycopg.connect(db_url)
+        cursor = conn.cursor()
+
+        print("Running migration: Adding directory_id column and legal_name index...")
+
+        # Read the SQL migration file
+        with open('add_subcontractor_directory_link.sql', 'r') as f:
+            cursor.execute(f.read())
+
+        # Commit the changes
+        conn.commit()
+
+        print("[SUCCESS] Migration completed successfully!")
+        print("[SUCCESS] Added directory_id column to subcontractors table")
+
+        # Verify the indexes were created
+        cursor.execute("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE indexname IN ('idx_subcontractors_directory_id', 'idx_subcontractor_directory_legal_name');
+        """)
+
+        for row in cursor.fetchall():
+            print(f"[SUCCESS] Verified index exists: {row[0]}")
+
+        # Report how many subcontractors were linked
+        cursor.execute("""
+            SELECT COUNT(*) FILTER (WHERE directory_id IS NOT NULL), COUNT(*)
+            FROM subcontractors;
+        """)
+
+        linked, total = cursor.fetchone()
+        print(f"[SUCCESS] Linked {linked} of {total} subcontractors to directory entries")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"[ERROR] Error running migration: {e}")
+        if 'conn' in locals():
+            conn.rollback()
+            conn.close()
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,54 @@
+"""
+Migration script to add the keyset pagination index to subcontractor_directory table
+"""
+import psycopg
+
+from app.config import settings
+
+def run_migration():
+    """Run the migration to add the directory search order index"""
+
+    # Parse the database URL
+    db_url = settings.DATABASE_URL
+
+    # Connect to the database
+    try:
+        print("Connecting to database...")
+        conn = psycopg.connect(db_url)
+        cursor = conn.cursor()
+
+        print("Running migration: Adding directory search order index...")
+
+        # Read the SQL migration file
+        with open('add_directory_search_pagination.sql', 'r') as f:
+            cursor.execute(f.read())
+
+        # Commit the changes
+        conn.commit()
+
+        print("[SUCCESS] Migration completed successfully!")
+        print("[SUCCESS] Added search order index to subcontractor_directory table")
+
+        # Verify the indexes were created
+        cursor.execute("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'subcontractor_directory'
+            AND indexname = 'idx_subcontractor_directory_search_order';
+        """)
+
+        for row in cursor.fetchall():
+            print(f"[SUCCESS] Verified index exists: {row[0]}")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"[ERROR] Error running migration: {e}")
+        if 'conn' in locals():
+            conn.rollback()
+            conn.close()
+        raise
+
+if __name__ == "__main__":
+    run_migration()
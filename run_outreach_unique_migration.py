@@ -0,0 +1,77 @@
+"""
+Migration script to make subcontractor_outreach unique per organization, opportunity and subcontractor
+"""
+import psycopg
+
+from app.config import settings
+
+def run_migration():
+    """Run the migration to merge duplicate outreach and add the unique constraint"""
+
+    # Parse the database URL
+    db_url = settings.DATABASE_URL
+
+    # Connect to the database
+    try:
+        print("Connecting to database...")
+        conn = psycopg.connect(db_url)
+        cursor = conn.cursor()
+
+        # Report the duplicate groups before merging them
+        cursor.execute("""
+            SELECT organization_id, opportunity_id, subcontractor_id,
+                   count(*) AS records,
+                   string_agg(coalesce(status, '-'), ', ' ORDER BY contact_date) AS statuses
+            FROM subcontractor_outreach
+            WHERE organization_id IS NOT NULL
+            AND opportunity_id IS NOT NULL
+            AND subcontractor_id IS NOT NULL
+            GROUP BY organization_id, opportunity_id, subcontractor_id
+            HAVING count(*) > 1
+            ORDER BY count(*) DESC;
+        """)
+        duplicate_groups = cursor.fetchall()
+        print(f"Found {len(duplicate_groups)} duplicate outreach groups")
+        for organization_id, opportunity_id, subcontractor_id, records, statuses in duplicate_groups:
+            print(
+                f"  organization {organization_id}, opportunity {opportunity_id}, "
+                f"subcontractor {subcontractor_id}: {records} records ({statuses})"
+            )
+
+        print("Running migration: Merging duplicate outreach and adding unique constraint...")
+
+        # Read the SQL migration file
+        with open('add_outreach_unique_constraint.sql', 'r') as f:
+            cursor.execute(f.read())
+
+        # Commit the changes
+        conn.commit()
+
+        print("[SUCCESS] Migration completed successfully!")
+        print("[SUCCESS] Added unique constraint to subcontractor_outreach table")
+        if duplicate_groups:
+            print("[SUCCESS] Removed duplicates were copied to subcontractor_outreach_duplicates")
+
+        # Verify the constraint was created
+        cursor.execute("""
+            SELECT conname
+            FROM pg_constraint
+            WHERE conrelid = 'subcontractor_outreach'::regclass
+            AND conname = 'uq_subcontractor_outreach_org_opportunity_sub';
+        """)
+
+        for row in cursor.fetchall():
+            print(f"[SUCCESS] Verified constraint exists: {row[0]}")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"[ERROR] Error running migration: {e}")
+        if 'conn' in locals():
+            conn.rollback()
+            conn.close()
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,56 @@
+"""
+Migration script to index subcontractor_outreach for incremental contractor usage counts
+"""
+import psycopg
+
+from app.config import settings
+
+def run_migration():
+    """Run the migration to add the outreach usage index and reconcile usage counts"""
+
+    # Parse the database URL
+    db_url = settings.DATABASE_URL
+
+    # Connect to the database
+    try:
+        print("Connecting to database...")
+        conn = psycopg.connect(db_url)
+        cursor = conn.cursor()
+
+        print("Running migration: Adding subcontractor_outreach (subcontractor_id, organization_id) index...")
+
+        # Read the SQL migration file
+        with open('add_outreach_usage_index.sql', 'r') as f:
+            cursor.execute(f.read())
+
+        # Commit the changes
+        conn.commit()
+
+        print("[SUCCESS] Migration completed successfully!")
+        print("[SUCCESS] Reconciled contractors_using_count with outreach")
+
+        # Verify the indexes were created
+        cursor.execute("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'subcontractor_outreach'
+            AND indexname IN (
+                'idx_subcontractor_outreach_subcontractor_org'
+            );
+        """)
+
+        for row in cursor.fetchall():
+            print(f"[SUCCESS] Verified index exists: {row[0]}")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"[ERROR] Error running migration: {e}")
+        if 'conn' in locals():
+            conn.rollback()
+            conn.close()
+        raise
+
+if __name__ == "__main__":
+    run_migration()
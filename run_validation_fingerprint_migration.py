@@ -0,0 +1,55 @@
+"""
+Migration script to add input_fingerprint column to validation_results table
+"""
+import psycopg
+
+from app.config import settings
+
+def run_migration():
+    """Run the migration to add input_fingerprint column"""
+
+    # Parse the database URL
+    db_url = settings.DATABASE_URL
+
+    # Connect to the database
+    try:
+        print("Connecting to database...")
+        conn = psycopg.connect(db_url)
+        cursor = conn.cursor()
+
+        print("Running migration: Adding input_fingerprint column...")
+
+        # Read the SQL migration file
+        with open('add_validation_fingerprint.sql', 'r') as f:
+            cursor.execute(f.read())
+
+        # Commit the changes
+        conn.commit()
+
+        print("[SUCCESS] Migration completed successfully!")
+        print("[SUCCESS] Added input_fingerprint column to validation_results table")
+
+        # Verify the column was added
+        cursor.execute("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_name = 'validation_results'
+            AND column_name = 'input_fingerprint';
+        """)
+
+        result = cursor.fetchone()
+        if result:
+            print(f"[SUCCESS] Verified column exists: {result[0]} ({result[1]})")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"[ERROR] Error running migration: {e}")
+        if 'conn' in locals():
+            conn.rollback()
+            conn.close()
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,125 @@
+"""
+Query plan checks for the directory filter indexes
+Run this after the migration: python run_directory_filter_index_migration.py
+then: python test_directory_indexes.py
+
+Each check EXPLAINs a directory filter as the services build it and asserts
+the plan uses the expected GIN index. Sequential scans are disabled for the
+check so the planner picks the index even on a small development table.
+"""
+import json
+
+from sqlalchemy import text
+
+from app.database import SessionLocal, Explain
+from app.models import SubcontractorDirectory
+from app.schemas.subcontractor_directory import SubcontractorSearchFilters
+from app.services.subcontractor_directory_service import SubcontractorDirectoryService
+
+JURISDICTION_INDEX = "idx_subcontractor_directory_jurisdiction_codes"
+NAICS_INDEX = "idx_subcontractor_directory_naics_codes"
+CERTIFICATIONS_INDEX = "idx_subcontractor_directory_certifications"
+
+def explain(db, query):
+    """JSON plan of a query, with sequential scans disabled"""
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return db.execute(Explain(query.statement)).scalar()
+
+def indexes_used(plan):
+    """Names of every index referenced anywhere in a plan"""
+    names = set()
+
+    def walk(node):
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return names
+
+def check_plan(db, name, query, expected_indexes):
+    """Assert a query's plan uses every expected index"""
+    print(f"\n{name}...")
+    try:
+        plan = explain(db, query)
+        used = indexes_used(plan)
+        missing = set(expected_indexes) - used
+        assert not missing, f"missing {sorted(missing)}, plan uses {sorted(used) or 'no index'}"
+        print(f"   ✓ PASSED (uses {', '.join(sorted(used))})")
+        return True
+    except AssertionError as e:
+        print(f"   ✗ FAILED: {e}")
+        print(json.dumps(plan, indent=2))
+        return False
+    except Exception as e:
+        print(f"   ✗ FAILED: {e}")
+        return False
+    finally:
+        db.rollback()
+
+def main():
+    """Run all plan checks"""
+    print("=" * 70)
+    print("Directory Filter Index Checks")
+    print("=" * 70)
+
+    db = SessionLocal()
+    service = SubcontractorDirectoryService(db)
+
+    def search(**filters):
+        query, _ = service._search_query(SubcontractorSearchFilters(**filters))
+        return query
+
+    checks = [
+        (
+            "Search by jurisdiction (overlap)",
+            search(jurisdiction_codes=["MD"]),
+            [JURISDICTION_INDEX]
+        ),
+        (
+            "Search by NAICS (overlap)",
+            search(naics_codes=["236220"]),
+            [NAICS_INDEX]
+        ),
+        (
+            "Search by MBE certification (containment)",
+            search(is_mbe=True),
+            [CERTIFICATIONS_INDEX]
+        ),
+        (
+            "Search by VSBE certification (containment)",
+            search(is_vsbe=True),
+            [CERTIFICATIONS_INDEX]
+        ),
+        (
+            "Opportunity match jurisdiction (containment)",
+            db.query(SubcontractorDirectory).filter(
+                SubcontractorDirectory.jurisdiction_codes.contains(["MD"])
+            ),
+            [JURISDICTION_INDEX]
+        ),
+    ]
+
+    results = []
+    try:
+        for name, query, expected in checks:
+            results.append((name, check_plan(db, name, query, expected)))
+    finally:
+        db.close()
+
+    # Summary
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for name, result in results:
+        status = "✓ PASS" if result else "✗ FAIL"
+        print(f"  {status:8} - {name}")
+    print(f"\nResults: {passed}/{len(results)} checks passed")
+    print("=" * 70)
+
+    if passed != len(results):
+        print("\n⚠ Some checks failed. Did you run run_directory_filter_index_migration.py?")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()